@@ -0,0 +1,419 @@
+"""
+Benchmarks for winnow's hot paths: scanning, the decision log, image decode
+through _load_media (with preload hit rates) and move throughput.
+
+Everything runs on synthetic folders generated from a seed, offscreen, and
+the results are written as JSON so runs can be compared across commits:
+
+    python benchmarks/bench.py --entries 100000 --out before.json
+    python benchmarks/bench.py --entries 100000 --out after.json --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+import subprocess
+from types import SimpleNamespace
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QEventLoop, QRect, QBuffer, QByteArray, QT_VERSION_STR
+from PyQt6.QtGui import QImage, QColor, QPainter, QLinearGradient
+
+KINDS = ('jpeg', 'png', 'csv', 'text', 'video', 'dir', 'other')
+DEFAULT_MIX = "jpeg=40,png=10,csv=10,text=20,video=10,dir=5,other=5"
+EXTS = {'jpeg': '.jpg', 'png': '.png', 'csv': '.csv', 'text': '.txt', 'video': '.mp4', 'dir': '', 'other': '.bin'}
+
+
+def parse_mix(text):
+    """'jpeg=40,png=10,...' -> {kind: weight}."""
+    mix = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        kind = kind.strip()
+        if kind not in KINDS:
+            raise argparse.ArgumentTypeError(f"unknown kind '{kind}' (expected one of {', '.join(KINDS)})")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def encode(img, fmt):
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QBuffer.OpenModeFlag.WriteOnly)
+    img.save(buf, fmt, 90)
+    return bytes(data)
+
+
+def synthetic_image(width, height, rng):
+    """A gradient with a few random boxes: compresses like a photo-ish image, not like noise."""
+    img = QImage(width, height, QImage.Format.Format_RGB32)
+    painter = QPainter(img)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    gradient.setColorAt(1, QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    painter.fillRect(0, 0, width, height, gradient)
+    for _ in range(40):
+        w, h = rng.randrange(1, max(2, width // 4)), rng.randrange(1, max(2, height // 4))
+        painter.fillRect(QRect(rng.randrange(width), rng.randrange(height), w, h),
+                         QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    painter.end()
+    return img
+
+
+def generate(directory, entries, mix, seed):
+    """
+    Fill `directory` with `entries` items in proportion to `mix`. Every file is
+    distinct (a per-file suffix), so duplicate detection has nothing to fold.
+    Returns {kind: count}.
+    """
+    rng = random.Random(seed)
+    total_weight = sum(mix.values())
+    counts = {kind: int(entries * weight / total_weight) for kind, weight in mix.items()}
+    counts[max(mix, key=mix.get)] += entries - sum(counts.values())
+    kinds = [kind for kind, n in counts.items() for _ in range(n)]
+    rng.shuffle(kinds)
+
+    templates = {
+        'jpeg': encode(synthetic_image(160, 120, rng), "JPG"),
+        'png': encode(synthetic_image(160, 120, rng), "PNG"),
+        'video': b'\0\0\0\x18ftypmp42' + bytes(1024),  # Stub: right header, no playable stream
+        'other': bytes(rng.randrange(256) for _ in range(256)),
+    }
+    os.makedirs(directory, exist_ok=True)
+    for i, kind in enumerate(kinds):
+        path = os.path.join(directory, f"f{i:07d}{EXTS[kind]}")
+        if kind == 'dir':
+            os.mkdir(path)
+            with open(os.path.join(path, "inside.txt"), 'w') as f:
+                f.write(f"{i}\n")
+            continue
+        with open(path, 'wb') as f:
+            if kind == 'csv':
+                f.write(b"id,name,value\n" + b"".join(b"%d,row%d,%d\n" % (i, r, r * i) for r in range(20)))
+            elif kind == 'text':
+                f.write(b"".join(b"line %d of file %d\n" % (r, i) for r in range(20)))
+            else:
+                # Trailing bytes after the image data are ignored by decoders
+                f.write(templates[kind] + b"%d" % i)
+    return counts
+
+
+def generate_images(directory, count, width, height, seed):
+    """`count` full-size JPEG/PNG images (3 JPEG : 1 PNG) for the decode benchmark."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    templates = [(encode(synthetic_image(width, height, rng), "JPG"), '.jpg') for _ in range(3)]
+    templates.append((encode(synthetic_image(width, height, rng), "PNG"), '.png'))
+    for i in range(count):
+        data, ext = templates[i % len(templates)]
+        with open(os.path.join(directory, f"img{i:05d}{ext}"), 'wb') as f:
+            f.write(data + b"%d" % i)
+
+
+def timed(fn, repeat):
+    """Run fn() `repeat` times; returns (best seconds, median seconds, last result)."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t)
+    return min(times), statistics.median(times), result
+
+
+def wait_until(app, predicate, timeout=120.0):
+    """Run the event loop until predicate() holds. Returns False on timeout."""
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 5)
+        time.sleep(0.0005)
+    return True
+
+
+@contextlib.contextmanager
+def quiet():
+    """winnow prints a line per move and per scan; keep the report readable."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {}
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99), 'max': samples[-1], 'n': len(samples)}
+
+
+# --- Benchmarks ---
+
+def bench_scan(winnow, app, directory, names, repeat):
+    """_scan_directory with an empty and a fully populated log, and the streaming DirectoryScanner."""
+    results = {}
+    log_path = os.path.join(directory, ".winnow_log.db")
+    for f in (log_path, log_path + "-wal", log_path + "-shm"):
+        if os.path.exists(f):
+            os.remove(f)
+    ns = SimpleNamespace(directory=directory, log_file=log_path, legacy_log_file=os.path.join(directory, ".winnow_log"))
+    ns.viewed_log = winnow.MediaCuller._load_log(ns)
+    with quiet():
+        best, median, found = timed(lambda: winnow.MediaCuller._scan_directory(ns), repeat)
+    results['empty_log'] = {'best_s': best, 'median_s': median, 'entries_per_s': len(names) / best, 'found': len(found)}
+
+    for name in names:
+        ns.viewed_log.record(name, 'keep')
+    ns.viewed_log.flush()
+    with quiet():
+        best, median, found = timed(lambda: winnow.MediaCuller._scan_directory(ns), repeat)
+    results['all_logged'] = {'best_s': best, 'median_s': median, 'entries_per_s': len(names) / best, 'found': len(found)}
+    ns.viewed_log.reset()
+
+    # The GUI path: sorted batches streamed from a worker thread
+    scanner = winnow.DirectoryScanner()
+    firsts, totals = [], []
+    for _ in range(repeat):
+        state = {'first': None, 'done': None}
+        def on_batch(generation, batch, state=state):
+            if state['first'] is None:
+                state['first'] = time.perf_counter()
+        def on_finished(generation, seen, skipped, state=state):
+            state['done'] = time.perf_counter()
+        scanner.batch_ready.connect(on_batch)
+        scanner.finished.connect(on_finished)
+        t = time.perf_counter()
+        scanner.start(directory, winnow.is_scan_candidate, ns.viewed_log.contains_entry)
+        wait_until(app, lambda: state['done'] is not None)
+        scanner.batch_ready.disconnect(on_batch)
+        scanner.finished.disconnect(on_finished)
+        firsts.append(state['first'] - t if state['first'] else None)
+        totals.append(state['done'] - t)
+    results['streamed'] = {'first_batch_s': min(f for f in firsts if f is not None), 'best_s': min(totals),
+                           'median_s': statistics.median(totals)}
+    ns.viewed_log.close()
+    return results
+
+
+def bench_log(winnow, directory, names, repeat):
+    """_log_file_viewed throughput, _load_log on a full log and on a legacy text log, and lookups."""
+    results = {}
+    work = tempfile.mkdtemp(prefix="log-", dir=os.path.dirname(directory))
+    try:
+        ns = SimpleNamespace(directory=directory, log_file=os.path.join(work, "log.db"),
+                             legacy_log_file=os.path.join(work, "legacy"))
+        ns.viewed_log = winnow.MediaCuller._load_log(ns)
+
+        def record_all():
+            ns.viewed_log.reset()
+            for name in names:
+                winnow.MediaCuller._log_file_viewed(ns, name, 'keep')
+            ns.viewed_log.flush()
+        best, median, _ = timed(record_all, repeat)
+        results['log_file_viewed'] = {'best_s': best, 'median_s': median, 'records_per_s': len(names) / best}
+        ns.viewed_log.close()
+
+        best, median, _ = timed(lambda: winnow.MediaCuller._load_log(ns).close(), repeat)
+        results['load_log'] = {'best_s': best, 'median_s': median, 'rows': len(names)}
+
+        def import_legacy():
+            with open(ns.legacy_log_file, 'w', encoding='utf-8') as f:
+                f.writelines(name + "\n" for name in names)
+            legacy_ns = SimpleNamespace(log_file=os.path.join(work, "fresh.db"), legacy_log_file=ns.legacy_log_file)
+            with quiet():
+                winnow.MediaCuller._load_log(legacy_ns).close()
+            os.remove(legacy_ns.log_file)
+            os.remove(ns.legacy_log_file + ".imported")
+        best, median, _ = timed(import_legacy, repeat)
+        results['load_log_legacy_import'] = {'best_s': best, 'median_s': median, 'rows': len(names)}
+
+        log = winnow.MediaCuller._load_log(ns)
+        rng = random.Random(0)
+        probes = [rng.choice(names) if i % 2 else f"missing{i}" for i in range(min(20000, 2 * len(names)))]
+        best, median, _ = timed(lambda: [log.contains(p) for p in probes], repeat)
+        results['contains'] = {'best_s': best, 'median_s': median, 'lookups_per_s': len(probes) / best}
+        log.close()
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return results
+
+
+def open_culler(winnow, app, directory, **kwargs):
+    with quiet():
+        culler = winnow.MediaCuller(directory, turbo=True, **kwargs)
+        culler.resize(1280, 900)
+        culler.show()
+        wait_until(app, lambda: culler._scan_done)
+    return culler
+
+
+def close_culler(app, culler):
+    with quiet():
+        wait_until(app, lambda: culler.move_queue.pending() == 0)
+        culler.close()
+        app.processEvents()
+
+
+def bench_decode(winnow, app, directory, interval_ms, preview_cache_mb):
+    """
+    Step through the images with _load_media every `interval_ms`: time until
+    each is on screen and how often the preloader had it ready (a hit).
+    """
+    culler = open_culler(winnow, app, directory, preview_cache_mb=preview_cache_mb)
+    latencies, hits = [], 0
+    with quiet():
+        wait_until(app, lambda: culler._pending_image_path is None)
+        for index in range(len(culler.files)):
+            culler.current_index = index
+            key = culler._image_key(os.path.join(culler.directory, culler.files[index]))
+            hit = key in culler.image_cache
+            t = time.perf_counter()
+            culler._load_media()
+            wait_until(app, lambda: culler._pending_image_path is None)
+            latencies.append(time.perf_counter() - t)
+            hits += hit
+            # The user looks at it for a while; the preloader keeps going
+            end = time.perf_counter() + interval_ms / 1000
+            wait_until(app, lambda: time.perf_counter() >= end)
+    count = len(latencies)
+    stats = culler.image_cache.stats()
+    close_culler(app, culler)
+    return {'images': count, 'interval_ms': interval_ms, 'preload_hit_rate': hits / max(count, 1),
+            'display_s': percentiles(latencies), 'cache_evictions': stats['evictions']}
+
+
+def bench_moves(winnow, app, directory, action):
+    """Throughput of _move_to_rejected or _sort_file: GUI-side cost per call, and until the moves land."""
+    culler = open_culler(winnow, app, directory, preview_cache_mb=0)
+    if action == 'sort':
+        culler.flags[0]['name'] = "bench_flag"  # In memory only; flags.json is left alone
+        step = lambda: culler._sort_file(0)
+    else:
+        step = culler._move_to_rejected
+    count = len(culler.files)
+    with quiet():
+        t = time.perf_counter()
+        for _ in range(count):
+            step()
+            app.processEvents()
+        queued = time.perf_counter() - t
+        wait_until(app, lambda: culler.move_queue.pending() == 0)
+        done = time.perf_counter() - t
+    close_culler(app, culler)
+    return {'files': count, 'gui_s': queued, 'gui_per_file_ms': 1000 * queued / max(count, 1),
+            'total_s': done, 'files_per_s': count / done}
+
+
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = flatten(json.load(f)['results'])
+    current = flatten(results)
+    print(f"\nCompared with {baseline_path} (ratio = this run / baseline):")
+    for key in sorted(current):
+        if key in baseline and baseline[key]:
+            print(f"  {key:<55} {baseline[key]:>14.6g} -> {current[key]:<14.6g} x{current[key] / baseline[key]:.2f}")
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "-C", REPO, "describe", "--always", "--dirty"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark winnow's scan, log, decode and move paths.")
+    parser.add_argument("--entries", type=int, default=10000, help="Items in the scan/log folder (default: 10000)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Relative weights of {', '.join(KINDS)} (default: {DEFAULT_MIX})")
+    parser.add_argument("--images", type=int, default=40, help="Full-size images for the decode benchmark (default: 40)")
+    parser.add_argument("--image-size", default="4000x3000", help="Their size in pixels (default: 4000x3000)")
+    parser.add_argument("--interval-ms", type=int, default=150,
+                        help="Time spent on each image in the decode benchmark (default: 150)")
+    parser.add_argument("--moves", type=int, default=1000, help="Files moved by each move benchmark (default: 1000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each timed step; best and median are kept")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workdir", help="Where to generate the folders (default: a temporary directory)")
+    parser.add_argument("--keep", action="store_true", help="Leave the generated folders behind")
+    parser.add_argument("--out", default="benchmark.json", help="JSON results file (default: benchmark.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Print ratios against an earlier results file")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.image_size.lower().split('x'))
+
+    app = QApplication(sys.argv)
+    import winnow
+
+    root = tempfile.mkdtemp(prefix="winnow-bench-", dir=args.workdir)
+    # Preview and filmstrip caches go here too, not into the user's cache
+    os.environ['XDG_CACHE_HOME'] = os.path.join(root, "cache")
+    results = {}
+    try:
+        t = time.perf_counter()
+        scan_dir = os.path.join(root, "scan")
+        counts = generate(scan_dir, args.entries, args.mix, args.seed)
+        generate_images(os.path.join(root, "decode"), args.images, width, height, args.seed)
+        for action in ('reject', 'sort'):
+            # Moves are about file system work, not content
+            generate(os.path.join(root, f"move-{action}"), args.moves, {'jpeg': 1, 'text': 1}, args.seed)
+        print(f"Generated {args.entries} entries {counts} and {args.images} {width}x{height} images "
+              f"in {time.perf_counter() - t:.1f} s under {root}")
+
+        names = sorted(n for n in os.listdir(scan_dir) if winnow.is_scan_candidate(n))
+        print("Scanning...")
+        results['scan_directory'] = bench_scan(winnow, app, scan_dir, names, args.repeat)
+        print("Decision log...")
+        results['log'] = bench_log(winnow, scan_dir, names, args.repeat)
+        print("Decoding...")
+        results['decode_paced'] = bench_decode(winnow, app, os.path.join(root, "decode"), args.interval_ms, 0)
+        results['decode_rapid'] = bench_decode(winnow, app, os.path.join(root, "decode"), 0, 0)
+        # Second pass over the same files with the disk preview cache warm
+        bench_decode(winnow, app, os.path.join(root, "decode"), 0, 1024)
+        results['decode_preview_cache'] = bench_decode(winnow, app, os.path.join(root, "decode"), 0, 1024)
+        print("Moving...")
+        results['move_to_rejected'] = bench_moves(winnow, app, os.path.join(root, "move-reject"), 'reject')
+        results['sort_file'] = bench_moves(winnow, app, os.path.join(root, "move-sort"), 'sort')
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'revision': git_revision(), 'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(), 'qt': QT_VERSION_STR, 'platform': platform.platform(),
+            'cpus': os.cpu_count(), 'args': {k: v for k, v in vars(args).items() if k not in ('out', 'compare')},
+        },
+        'results': results,
+    }
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    for key, value in flatten(results).items():
+        print(f"  {key:<55} {value:.6g}")
+    print(f"Wrote {args.out}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
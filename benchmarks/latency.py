@@ -0,0 +1,276 @@
+"""
+Input-to-display latency and animation frame times for the culling UI.
+
+Drives MediaCuller offscreen with synthetic Right presses at the given rates
+and records, per press, the time until the next file has been painted, for
+images, CSVs, text files and PDFs. Then records the interval between frames
+of the keep (_animate_and_navigate) and sort (_animate_sort) transitions.
+Reports p50/p95/p99 and exits non-zero when a p95 is over budget:
+
+    python benchmarks/latency.py --rates 2,10,30 --latency-budget-ms 100
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench import generate_images, wait_until, quiet, percentiles, git_revision
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QObject, QEvent, Qt, QT_VERSION_STR
+from PyQt6.QtGui import QKeyEvent, QPdfWriter, QPainter, QPageSize
+
+VIEWS = ('image', 'csv', 'text', 'pdf')
+FRAME_MS = 1000 / 60  # What the animation timer aims for
+
+
+def write_copies(directory, template, ext, count):
+    """`count` distinct copies of `template` (a per-file suffix keeps caches honest)."""
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        with open(os.path.join(directory, f"item{i:05d}{ext}"), 'wb') as f:
+            f.write(template + b"\n%d\n" % i)
+
+
+def make_pdf(path, pages=3):
+    writer = QPdfWriter(path)
+    writer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
+    painter = QPainter(writer)
+    for page in range(pages):
+        if page:
+            writer.newPage()
+        for line in range(40):
+            painter.drawText(200, 300 + line * 250, f"Page {page + 1}, line {line + 1}: the quick brown fox")
+    painter.end()
+
+
+def generate(root, view, count, args):
+    directory = os.path.join(root, view)
+    if view == 'image':
+        width, height = (int(v) for v in args.image_size.lower().split('x'))
+        generate_images(directory, count, width, height, seed=1)
+    elif view == 'csv':
+        rows = b"".join(b"%d,name %d,%d.%02d,2024-01-%02d\n" % (r, r, r * 7, r % 100, r % 28 + 1) for r in range(20000))
+        write_copies(directory, b"id,name,amount,date\n" + rows, '.csv', count)
+    elif view == 'text':
+        lines = b"".join(b"2024-01-01 12:00:%02d INFO request %d handled in %d ms\n" % (r % 60, r, r % 250)
+                         for r in range(40000))  # ~2 MB: the head-and-tail path
+        write_copies(directory, lines, '.log', count)
+    elif view == 'pdf':
+        template = os.path.join(root, "template.pdf")
+        make_pdf(template)
+        with open(template, 'rb') as f:
+            write_copies(directory, f.read(), '.pdf', count)
+    return directory
+
+
+class PaintProbe(QObject):
+    """
+    Application-wide event filter that timestamps paints: of the page on
+    screen once it shows the expected file, and of the transition overlay.
+    """
+    def __init__(self, culler):
+        super().__init__()
+        self.culler = culler
+        self.presses = []  # [(time posted, index the press leads to)] not yet on screen
+        self.latencies = []
+        self.overlay_paints = []
+
+    def _shown_path(self):
+        """Path of the file the page on screen shows, or None if it has none yet."""
+        culler = self.culler
+        page = culler.stack.currentWidget()
+        if page is culler.image_widget:
+            # Cleared on every load, so any pixmap is the current file's
+            # (for a PDF, its pre-rendered first page)
+            if culler._pending_image_path is None and culler.image_widget.pixmap is not None:
+                return culler._current_path()
+        elif page is culler.pdf_view:
+            if culler.current_pdf_doc is not None and page.document() is culler.current_pdf_doc:
+                return culler._current_path()
+        elif page is culler.csv_widget or page is culler.text_widget:
+            return page.path
+        return None
+
+    def _showing_file(self):
+        """True once the page on screen shows the current file, not the one before it."""
+        path = self._shown_path()
+        return path is not None and path == self.culler._current_path()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and obj.isWidgetType():
+            now = time.perf_counter()
+            culler = self.culler
+            if obj is culler.overlay:
+                self.overlay_paints.append(now)
+            elif self.presses:
+                page = culler.stack.currentWidget()
+                if (obj is page or page.isAncestorOf(obj)) and self._showing_file():
+                    # Coalesced presses all land with the jump that covers them
+                    while self.presses and self.presses[0][1] <= culler.current_index:
+                        self.latencies.append(now - self.presses.pop(0)[0])
+        return False
+
+
+def open_culler(winnow, app, directory, turbo):
+    for name in os.listdir(directory):
+        if name.startswith(".winnow_log"):
+            os.remove(os.path.join(directory, name))
+    with quiet():
+        culler = winnow.MediaCuller(directory, preview_cache_mb=0, turbo=turbo)
+        culler.resize(1280, 900)
+        culler.show()
+        wait_until(app, lambda: culler._scan_done and culler.files)
+    probe = PaintProbe(culler)
+    app.installEventFilter(probe)
+    return culler, probe
+
+
+def close_culler(app, culler, probe):
+    app.removeEventFilter(probe)
+    with quiet():
+        wait_until(app, lambda: culler.move_queue.pending() == 0)
+        culler.close()
+        app.processEvents()
+
+
+def press(culler, key=Qt.Key.Key_Right):
+    QApplication.postEvent(culler, QKeyEvent(QEvent.Type.KeyPress, key, Qt.KeyboardModifier.NoModifier))
+
+
+def measure_latency(winnow, app, directory, rate, presses, turbo, settle_s):
+    """Keypress-to-paint latencies (seconds) for `presses` Right presses at `rate` per second."""
+    culler, probe = open_culler(winnow, app, directory, turbo)
+    with quiet():
+        # Start from a settled first file, as a user would
+        wait_until(app, probe._showing_file)
+        end = time.perf_counter() + settle_s
+        wait_until(app, lambda: time.perf_counter() >= end)
+        t0 = time.perf_counter()
+        for i in range(presses):
+            wait_until(app, lambda: time.perf_counter() >= t0 + i / rate)
+            probe.presses.append((time.perf_counter(), i + 1))
+            press(culler)
+        wait_until(app, lambda: not probe.presses, timeout=10)
+    missed = len(probe.presses)
+    close_culler(app, culler, probe)
+    return probe.latencies, missed
+
+
+def frame_intervals(paints):
+    """Intervals between consecutive overlay paints of one transition."""
+    return [b - a for a, b in zip(paints, paints[1:])]
+
+
+def measure_frames(winnow, app, directory, transitions, action):
+    """Overlay frame intervals (seconds) over `transitions` keep or sort transitions."""
+    culler, probe = open_culler(winnow, app, directory, turbo=False)
+    culler.flags[0]['name'] = "latency_flag"  # In memory only; flags.json is left alone
+    intervals = []
+    with quiet():
+        for _ in range(min(transitions, len(culler.files) - 1)):
+            wait_until(app, lambda: culler._pending_image_path is None)
+            probe.overlay_paints = []
+            if action == 'sort':
+                culler._sort_file(0)
+            else:
+                culler._animate_and_navigate(direction=1, action='keep')
+            wait_until(app, lambda: not culler.overlay.isVisible(), timeout=5)
+            intervals.extend(frame_intervals(probe.overlay_paints))
+            end = time.perf_counter() + 0.2
+            wait_until(app, lambda: time.perf_counter() >= end)
+    close_culler(app, culler, probe)
+    return intervals
+
+
+def in_ms(stats):
+    return {k: (v * 1000 if k != 'n' else v) for k, v in stats.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure keypress-to-paint latency and transition frame times.")
+    parser.add_argument("--rates", default="2,10,30", help="Right presses per second, comma separated (default: 2,10,30)")
+    parser.add_argument("--presses", type=int, default=30, help="Presses per view and rate (default: 30)")
+    parser.add_argument("--views", default=",".join(VIEWS), help=f"Views to measure (default: {','.join(VIEWS)})")
+    parser.add_argument("--image-size", default="4000x3000", help="Size of the test images (default: 4000x3000)")
+    parser.add_argument("--transitions", type=int, default=20, help="Keep and sort transitions timed (default: 20)")
+    parser.add_argument("--turbo", action="store_true", help="Measure latency with transitions turned off")
+    parser.add_argument("--settle-ms", type=int, default=500,
+                        help="Time on the first file before pressing, so preloading can start (default: 500)")
+    parser.add_argument("--latency-budget-ms", type=float, default=100.0,
+                        help="Fail if any view's p95 keypress-to-paint latency is over this (default: 100)")
+    parser.add_argument("--frame-budget-ms", type=float, default=2 * FRAME_MS,
+                        help=f"Fail if the p95 frame interval of a transition is over this (default: {2 * FRAME_MS:.1f})")
+    parser.add_argument("--out", help="Also write the results as JSON")
+    args = parser.parse_args()
+    rates = [float(r) for r in args.rates.split(',')]
+    views = [v.strip() for v in args.views.split(',')]
+    for view in views:
+        if view not in VIEWS:
+            parser.error(f"unknown view '{view}' (expected one of {', '.join(VIEWS)})")
+
+    app = QApplication(sys.argv)
+    import winnow
+
+    root = tempfile.mkdtemp(prefix="winnow-latency-")
+    os.environ['XDG_CACHE_HOME'] = os.path.join(root, "cache")
+    results = {'latency': {}, 'frames': {}}
+    failures = []
+    try:
+        for view in views:
+            directory = generate(root, view, args.presses + 1, args)
+            for rate in rates:
+                latencies, missed = measure_latency(winnow, app, directory, rate, args.presses, args.turbo,
+                                                    args.settle_ms / 1000)
+                stats = in_ms(percentiles(latencies))
+                stats['missed'] = missed
+                results['latency'][f"{view}@{rate:g}/s"] = stats
+                p95 = stats.get('p95', float('inf'))
+                if missed or p95 > args.latency_budget_ms:
+                    failures.append(f"{view} at {rate:g}/s: p95 {p95:.1f} ms"
+                                    + (f", {missed} presses never painted" if missed else ""))
+
+        frames_dir = os.path.join(root, "frames")
+        for action in ('keep', 'sort'):
+            directory = os.path.join(frames_dir, action)
+            generate_images(directory, args.transitions + 1, 1600, 1200, seed=2)
+            intervals = measure_frames(winnow, app, directory, args.transitions, action)
+            stats = in_ms(percentiles(intervals))
+            stats['dropped'] = sum(1 for i in intervals if i * 1000 > 1.5 * FRAME_MS)
+            results['frames'][action] = stats
+            if not intervals or stats['p95'] > args.frame_budget_ms:
+                failures.append(f"{action} transition: p95 frame {stats.get('p95', float('inf')):.1f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"{'keypress to paint':<22}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'n':>6}")
+    for name, stats in results['latency'].items():
+        print(f"  {name:<20}" + "".join(f"{stats.get(k, float('nan')):>9.1f}" for k in ('p50', 'p95', 'p99', 'max'))
+              + f"{stats.get('n', 0):>6}" + (f"  ({stats['missed']} missed)" if stats['missed'] else ""))
+    print(f"{'frame interval':<22}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'n':>6}")
+    for name, stats in results['frames'].items():
+        print(f"  {name:<20}" + "".join(f"{stats.get(k, float('nan')):>9.1f}" for k in ('p50', 'p95', 'p99', 'max'))
+              + f"{stats.get('n', 0):>6}  ({stats['dropped']} dropped)")
+    print("All times in ms.")
+
+    if args.out:
+        report = {'meta': {'revision': git_revision(), 'time': time.strftime("%Y-%m-%dT%H:%M:%S"), 'qt': QT_VERSION_STR,
+                           'args': vars(args)},
+                  'budget_ms': {'latency_p95': args.latency_budget_ms, 'frame_p95': args.frame_budget_ms},
+                  'results': results, 'passed': not failures}
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print(f"PASS (p95 latency <= {args.latency_budget_ms:g} ms, p95 frame interval <= {args.frame_budget_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,158 +1,2747 @@
 import sys
 import os
 import shutil
-import glob
-from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QStackedWidget, QMessageBox, QSizePolicy, QFrame,
-    QGraphicsOpacityEffect, QGraphicsProxyWidget
-)
-from PyQt6.QtCore import (
-    Qt, QUrl, QSize, QTimer, QPropertyAnimation, QEasingCurve, 
-    QPoint, QParallelAnimationGroup, QRect
-)
+import heapq
+import itertools
+import threading
+import argparse
+import time
+import hashlib
+import tempfile
+import sqlite3
+import pathlib
+import uuid
+import queue
+import errno
+import stat
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+import struct
+import io
+import mmap
+import json
+import fnmatch
+from collections import OrderedDict
+from array import array
+
+LAUNCHED = time.perf_counter()  # Reference for the time-to-first-paint report
+
+# Everything above the PyQt6 imports is plain Python, so the headless --apply
+# mode below runs on servers without Qt (or a display) installed.
+
+
+def format_size(n):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n < 1024 or unit == 'GB':
+            return f"{n:.0f} {unit}" if unit == 'B' else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def _jpeg_dimensions(f, offset, limit=1024 * 1024):
+    """
+    (width, height) of the JPEG stream at `offset`, read from its SOF marker.
+    Returns None for anything Qt cannot decode, e.g. the lossless JPEG used
+    for raw sensor data in CR2/DNG.
+    """
+    f.seek(offset)
+    if f.read(2) != b'\xff\xd8':
+        return None
+    pos = 2
+    while pos < limit:
+        marker = f.read(4)
+        if len(marker) < 4 or marker[0] != 0xFF:
+            return None
+        kind = marker[1]
+        length = struct.unpack('>H', marker[2:])[0]
+        if kind in (0xC0, 0xC1, 0xC2):  # Baseline, extended, progressive
+            sof = f.read(5)
+            if len(sof) < 5:
+                return None
+            h, w = struct.unpack('>HH', sof[1:5])
+            return (w, h)
+        if 0xC3 <= kind <= 0xCF and kind not in (0xC4, 0xC8, 0xCC):
+            return None  # Lossless/arithmetic coding
+        if kind in (0xDA, 0xD9):
+            return None
+        f.seek(length - 2, os.SEEK_CUR)
+        pos += 2 + length
+    return None
+
+
+class ViewedLog:
+    """
+    Decisions made in a folder, kept in a SQLite database (WAL mode) next to it.
+
+    Rows are keyed by file identity (inode, size, mtime) with the name as a
+    secondary key, so a renamed file keeps its state. Lookups hit indexes and
+    writes are buffered and committed in groups, so startup and per-keypress
+    cost stay flat however long the log gets. A legacy one-name-per-line
+    .winnow_log is imported on first use. Safe to share between threads.
+
+    With `read_only` nothing on disk is created or changed: the database is
+    opened read-only if it exists, and otherwise (with any legacy log) read
+    into memory.
+    """
+    FLUSH_EVERY = 32
+
+    def __init__(self, path, legacy_path=None, read_only=False):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = []  # [(name, ino, size, mtime_ns, action, ts)]
+        self._pending_names = set()
+        if read_only:
+            if os.path.exists(path):
+                uri = pathlib.Path(os.path.abspath(path)).as_uri() + "?mode=ro"
+                if not os.path.exists(path + "-wal"):
+                    uri += "&immutable=1"  # Else even a reader leaves -wal/-shm files behind
+                self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                return
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._create_tables()
+            if legacy_path and os.path.exists(legacy_path):
+                self._import_legacy(legacy_path, keep=True)
+            return
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")  # One fsync per group commit
+        self._create_tables()
+        if legacy_path and os.path.exists(legacy_path):
+            self._import_legacy(legacy_path)
+
+    def _create_tables(self):
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS decisions ("
+            "name TEXT NOT NULL, ino INTEGER, size INTEGER, mtime_ns INTEGER, "
+            "action TEXT NOT NULL, ts REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS decisions_name ON decisions(name)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS decisions_identity ON decisions(ino, size, mtime_ns)")
+        self._conn.commit()
+
+    def _import_legacy(self, legacy_path, keep=False):
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                names = [line.strip() for line in f if line.strip()]
+            now = time.time()
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT INTO decisions (name, action, ts) VALUES (?, 'viewed', ?)", ((n, now) for n in names))
+                self._conn.commit()
+            if keep:
+                return
+            os.replace(legacy_path, legacy_path + ".imported")
+            print(f"Imported {len(names)} entries from {os.path.basename(legacy_path)}")
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error importing legacy log: {e}")
+
+    def record(self, name, action, st=None):
+        """Buffer a decision for `name`; `st` is its os.stat_result taken before any move."""
+        row = (name, st.st_ino if st else None, st.st_size if st else None,
+               st.st_mtime_ns if st else None, action, time.time())
+        with self._lock:
+            self._pending.append(row)
+            self._pending_names.add(name)
+            if len(self._pending) >= self.FLUSH_EVERY:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        try:
+            self._conn.executemany(
+                "INSERT INTO decisions (name, ino, size, mtime_ns, action, ts) VALUES (?, ?, ?, ?, ?, ?)",
+                self._pending)
+            self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error writing to log: {e}")
+            return
+        self._pending = []
+        self._pending_names = set()
+
+    def contains(self, name, st=None):
+        """True if `name`, or a file with the identity of `st`, has a recorded decision."""
+        with self._lock:
+            if name in self._pending_names:
+                return True
+            if self._conn.execute("SELECT 1 FROM decisions WHERE name = ? LIMIT 1", (name,)).fetchone():
+                return True
+            if st is not None:
+                return self._conn.execute(
+                    "SELECT 1 FROM decisions WHERE ino = ? AND size = ? AND mtime_ns = ? LIMIT 1",
+                    (st.st_ino, st.st_size, st.st_mtime_ns)).fetchone() is not None
+            return False
+
+    def contains_entry(self, entry):
+        """contains() for an os.DirEntry, only stat()ing it when the inode is already known."""
+        if self.contains(entry.name):
+            return True
+        with self._lock:
+            known = self._conn.execute(
+                "SELECT 1 FROM decisions WHERE ino = ? LIMIT 1", (entry.inode(),)).fetchone()
+        if not known:
+            return False
+        try:
+            return self.contains(entry.name, entry.stat(follow_symlinks=False))
+        except OSError:
+            return False
+
+    def forget(self, name):
+        """Drop every decision recorded for `name` (e.g. when its move failed)."""
+        with self._lock:
+            self._flush_locked()
+            self._conn.execute("DELETE FROM decisions WHERE name = ?", (name,))
+            self._conn.commit()
+
+    def actions(self):
+        """{action: count} over the whole log."""
+        with self._lock:
+            self._flush_locked()
+            return dict(self._conn.execute("SELECT action, COUNT(*) FROM decisions GROUP BY action"))
+
+    def reset(self):
+        with self._lock:
+            self._pending = []
+            self._pending_names = set()
+            self._conn.execute("DELETE FROM decisions")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+
+def unique_destination(target_dir, filename):
+    """Path in `target_dir` for `filename`, with a random suffix if the name is taken."""
+    dst = os.path.join(target_dir, filename)
+    while os.path.lexists(dst):
+        base, ext = os.path.splitext(filename)
+        dst = os.path.join(target_dir, f"{base}_{uuid.uuid4().hex[:6]}{ext}")
+    return dst
+
+
+COPY_CHUNK = 64 * 1024 * 1024  # Also the size from which moves report progress
+
+
+def _kernel_copy(fsrc, fdst, total, progress=None):
+    """
+    Copy `total` bytes between two unbuffered file objects, preferring in-kernel
+    copies (copy_file_range, then sendfile) over a userspace buffer.
+    """
+    infd, outfd = fsrc.fileno(), fdst.fileno()
+    copy_range = getattr(os, 'copy_file_range', None)
+    sendfile = getattr(os, 'sendfile', None) if sys.platform.startswith('linux') else None
+    done = 0
+    while done < total:
+        n = min(COPY_CHUNK, total - done)
+        if copy_range is not None:
+            try:
+                sent = copy_range(infd, outfd, n)
+            except OSError as e:
+                if e.errno in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF, errno.EPERM):
+                    copy_range = None  # Filesystem pair not supported; fall back
+                    continue
+                raise
+        elif sendfile is not None:
+            try:
+                sent = sendfile(outfd, infd, done, n)
+            except OSError as e:
+                if e.errno in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                    sendfile = None
+                    continue
+                raise
+        else:
+            fsrc.seek(done)
+            data = memoryview(fsrc.read(n))
+            sent = len(data)
+            while data:
+                data = data[fdst.write(data):]
+        if not sent:
+            raise OSError(errno.EIO, f"source shrank during copy ({done} of {total} bytes)")
+        done += sent
+        if progress is not None and total >= COPY_CHUNK:
+            progress(done, total)
+
+
+def _file_digest(path):
+    h = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(4 * 1024 * 1024), b''):
+            h.update(block)
+    return h.digest()
+
+
+def _copy_file(src, dst, progress=None, verify=False):
+    """Copy one file's data and metadata; never leaves a partial `dst` behind."""
+    try:
+        with open(src, 'rb', buffering=0) as fsrc, open(dst, 'xb', buffering=0) as fdst:
+            _kernel_copy(fsrc, fdst, os.fstat(fsrc.fileno()).st_size, progress)
+        try:
+            shutil.copystat(src, dst)
+        except OSError as e:
+            # Data is intact; some targets (FAT, SMB) cannot hold every attribute
+            print(f"Could not copy metadata to {dst}: {e}")
+        if verify and _file_digest(src) != _file_digest(dst):
+            raise OSError(errno.EIO, f"checksum mismatch copying {src}")
+    except BaseException:
+        try:
+            os.unlink(dst)
+        except OSError:
+            pass
+        raise
+    return dst
+
+
+def move_path(src, dst, progress=None, verify=False):
+    """
+    Move a file or folder to `dst` (which must not exist yet).
+
+    Same filesystem: a plain os.rename. Across filesystems (EXDEV) the data is
+    copied in the kernel in COPY_CHUNK pieces with metadata preserved,
+    progress(done_bytes, total_bytes) is reported for large files, and with
+    verify=True both sides are checksummed before the source is removed.
+    """
+    try:
+        os.rename(src, dst)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    if os.path.islink(src):
+        os.symlink(os.readlink(src), dst)
+        os.unlink(src)
+    elif os.path.isdir(src):
+        try:
+            shutil.copytree(src, dst, symlinks=True,
+                            copy_function=lambda s, d: _copy_file(s, d, verify=verify))
+        except BaseException:
+            shutil.rmtree(dst, ignore_errors=True)
+            raise
+        shutil.rmtree(src)
+    else:
+        _copy_file(src, dst, progress, verify)
+        os.unlink(src)
+
+
+# --- Headless rule-based culling (winnow.py --apply RULES DIR) ---
+
+FLAGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "flags.json")
+FLAG_KEYS = "ASDF"
+
+
+def load_flags(path=FLAGS_FILE):
+    """Flag folders from flags.json ([{'name', 'color'}] for A, S, D, F), or None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            loaded = json.load(f)
+            # Check for legacy defaults and clear them if found
+            legacy_names = {'Reject', 'Maybe', 'Good', 'Best'}
+            for item in loaded:
+                if item.get('name') in legacy_names:
+                    item['name'] = ''
+            return loaded
+    except Exception:
+        return None
+
+
+def is_scan_candidate(f):
+    if f.startswith('.') or f == '_rejected': return False
+    if f == os.path.basename(__file__): return False
+    if f == "flags.json": return False
+    
+    # Check if it's a directory? The requirements say "browses all file types AND folders".
+    # But creating flag folders might create a loop if we scan them.
+    # We should exclude the flag folders from the scan to avoid moving a folder into itself or similar.
+    # Since flag folder names are dynamic, we just rely on "viewed" log or user sense?
+    # Best practice: Skip folders that match current flag names? 
+    # For now, simplistic scan.
+    return True
+
+
+def is_winnow_file(f):
+    """winnow's own state in the folder (log database, legacy log, journal)."""
+    return f.startswith('.winnow_')
+
+def scan_directory(directory, viewed_log):
+    """Sorted names in `directory` that are candidates and not yet decided, plus the entry count."""
+    entries = os.listdir(directory)
+    entries.sort()
+    found_files = []
+    for f in entries:
+        if not is_scan_candidate(f): continue
+        
+        # Check log
+        if viewed_log.contains(f): continue
+        
+        found_files.append(f)
+    return found_files, sum(1 for f in entries if not is_winnow_file(f))
+
+
+def image_dimensions(path):
+    """(width, height) from the header of a JPEG, PNG, GIF, BMP or WebP file, else None."""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(32)
+            if head.startswith(b'\xff\xd8'):
+                return _jpeg_dimensions(f, 0)
+    except OSError:
+        return None
+    if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+        return struct.unpack('>II', head[16:24])
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', head[6:10])
+    if head.startswith(b'BM') and len(head) >= 26:
+        w, h = struct.unpack('<ii', head[18:26])
+        return (w, abs(h))  # Negative height means top-down rows
+    if head.startswith(b'RIFF') and head[8:12] == b'WEBP':
+        chunk = head[12:16]
+        if chunk == b'VP8 ' and len(head) >= 30:
+            w, h = struct.unpack('<HH', head[26:30])
+            return (w & 0x3FFF, h & 0x3FFF)
+        if chunk == b'VP8L' and len(head) >= 25:
+            bits = int.from_bytes(head[21:25], 'little')
+            return ((bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+        if chunk == b'VP8X' and len(head) >= 30:
+            return (int.from_bytes(head[24:27], 'little') + 1, int.from_bytes(head[27:30], 'little') + 1)
+    return None
+
+
+RULE_PREDICATES = {'name', 'ext', 'kind', 'older_than_days', 'newer_than_days', 'min_size', 'max_size',
+                   'min_width', 'max_width', 'min_height', 'max_height'}
+DIMENSION_PREDICATES = ('min_width', 'max_width', 'min_height', 'max_height')
+
+
+def load_rules(path, flags):
+    """
+    Parse a rules file into [(rule, action, target folder name or None)].
+
+    The file holds a list of rules (or {"rules": [...]}); each rule is a set of
+    predicates plus "to": "reject", "keep", a flag key (A/S/D/F) or a flag
+    folder name from flags.json. Raises ValueError on anything it cannot use.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = json.load(f)
+    if isinstance(rules, dict):
+        rules = rules.get('rules')
+    if not isinstance(rules, list):
+        raise ValueError("expected a list of rules")
+    flag_names = [flag.get('name', '') for flag in (flags or [])]
+    parsed = []
+    for i, rule in enumerate(rules, 1):
+        if not isinstance(rule, dict):
+            raise ValueError(f"rule {i} is not an object")
+        unknown = set(rule) - RULE_PREDICATES - {'to'}
+        if unknown:
+            raise ValueError(f"rule {i}: unknown key(s) {', '.join(sorted(unknown))}")
+        for key in RULE_PREDICATES - {'name', 'ext', 'kind'}:
+            if key in rule and (isinstance(rule[key], bool) or not isinstance(rule[key], (int, float))):
+                raise ValueError(f"rule {i}: {key} must be a number")
+        if rule.get('kind', 'file') not in ('file', 'dir'):
+            raise ValueError(f"rule {i}: kind must be 'file' or 'dir'")
+        to = rule.get('to')
+        if to == 'reject':
+            parsed.append((rule, 'reject', '_rejected'))
+        elif to == 'keep':
+            parsed.append((rule, 'keep', None))
+        elif isinstance(to, str) and to.upper() in FLAG_KEYS and len(to) == 1:
+            index = FLAG_KEYS.index(to.upper())
+            name = flag_names[index] if index < len(flag_names) else ''
+            if not name:
+                raise ValueError(f"rule {i}: flag {to.upper()} has no folder name in flags.json")
+            parsed.append((rule, f"flag:{name}", name))
+        elif to and to in flag_names:
+            parsed.append((rule, f"flag:{to}", to))
+        else:
+            raise ValueError(f"rule {i}: 'to' must be reject, keep, A/S/D/F or a flag name, not {to!r}")
+    return parsed
+
+
+def rule_matches(rule, name, path, st, now):
+    """True if every predicate in `rule` holds for the file; dimensions are read last, only if needed."""
+    if 'name' in rule and not fnmatch.fnmatch(name.lower(), rule['name'].lower()):
+        return False
+    if 'ext' in rule:
+        exts = rule['ext'] if isinstance(rule['ext'], list) else [rule['ext']]
+        ext = os.path.splitext(name)[1].lower()
+        if ext not in {('.' + e.lstrip('.')).lower() for e in exts}:
+            return False
+    if 'kind' in rule and rule['kind'] != ('dir' if stat.S_ISDIR(st.st_mode) else 'file'):
+        return False
+    age_days = (now - st.st_mtime) / 86400
+    if 'older_than_days' in rule and not age_days > rule['older_than_days']:
+        return False
+    if 'newer_than_days' in rule and not age_days < rule['newer_than_days']:
+        return False
+    if 'min_size' in rule and st.st_size < rule['min_size']:
+        return False
+    if 'max_size' in rule and st.st_size > rule['max_size']:
+        return False
+    if any(key in rule for key in DIMENSION_PREDICATES):
+        size = image_dimensions(path) if stat.S_ISREG(st.st_mode) else None
+        if size is None:
+            return False
+        w, h = size
+        if w < rule.get('min_width', 0) or h < rule.get('min_height', 0):
+            return False
+        if w > rule.get('max_width', w) or h > rule.get('max_height', h):
+            return False
+    return True
+
+
+def apply_rules(directory, rules, dry_run=False, jobs=8, verify=False):
+    """
+    Evaluate `rules` (first match wins) over the undecided files in `directory`
+    and move the matches, both on a thread pool. Returns the number of failures.
+    """
+    directory = os.path.abspath(directory)
+    viewed_log = ViewedLog(os.path.join(directory, ".winnow_log.db"),
+                           legacy_path=os.path.join(directory, ".winnow_log"), read_only=dry_run)
+    try:
+        names, total = scan_directory(directory, viewed_log)
+        print(f"Found {len(names)} new items (Total items in dir: {total}).")
+        now = time.time()
+        targets = {target for _, _, target in rules}
+
+        def classify(name):
+            if name in targets:
+                return None  # Never move a destination folder into itself
+            path = os.path.join(directory, name)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                return None
+            for rule, action, target in rules:
+                if rule_matches(rule, name, path, st, now):
+                    return (name, st, action, target)
+            return None
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            matches = [m for m in pool.map(classify, names, chunksize=64) if m is not None]
+            groups = {}  # {(action, target): [(name, st)]}
+            for name, st, action, target in matches:
+                groups.setdefault((action, target), []).append((name, st))
+
+            for (action, target), files in groups.items():
+                size = sum(st.st_size for _, st in files)
+                where = f"to {target}" if target else "in place"
+                print(f"{action}: {len(files)} item{'s' if len(files) != 1 else ''} ({format_size(size)}) {where}")
+                if dry_run:
+                    for name, _ in files:
+                        print(f"  {name}")
+            if dry_run or not matches:
+                print(f"{len(matches)} of {len(names)} items matched" + (" (dry run, nothing moved)." if dry_run else "."))
+                return 0
+
+            def move(job):
+                name, st, action, target = job
+                if target is not None:
+                    dst = unique_destination(os.path.join(directory, target), name)
+                    move_path(os.path.join(directory, name), dst, verify=verify)
+                viewed_log.record(name, action, st)
+
+            for action, target in groups:
+                if target is not None:
+                    os.makedirs(os.path.join(directory, target), exist_ok=True)
+            failures = 0
+            for job, future in [(job, pool.submit(move, job)) for job in matches]:
+                try:
+                    future.result()
+                except Exception as e:
+                    failures += 1
+                    print(f"Could not move '{job[0]}': {str(e) or e.__class__.__name__}")
+        print(f"Applied {len(matches) - failures} of {len(matches)} decisions"
+              + (f", {failures} failed." if failures else "."))
+        return failures
+    finally:
+        viewed_log.close()
+
+
+def run_headless(argv):
+    parser = argparse.ArgumentParser(prog="winnow.py --apply",
+                                     description="Apply culling rules to a folder without opening a window.")
+    parser.add_argument("--apply", metavar="RULES", required=True, help="JSON rules file (see README)")
+    parser.add_argument("directory")
+    parser.add_argument("--dry-run", action="store_true", help="Report what each rule would do and move nothing")
+    parser.add_argument("--jobs", type=int, default=8, help="Files examined and moved in parallel (default: 8)")
+    parser.add_argument("--verify-moves", action="store_true",
+                        help="Checksum files copied to another filesystem before deleting the original")
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.directory):
+        print(f"Error: '{args.directory}' is not a directory.")
+        return 1
+    try:
+        rules = load_rules(args.apply, load_flags())
+    except (OSError, ValueError) as e:
+        print(f"Error reading rules from '{args.apply}': {e}")
+        return 1
+    try:
+        failures = apply_rules(args.directory, rules, dry_run=args.dry_run, jobs=max(1, args.jobs),
+                               verify=args.verify_moves)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        return 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__" and any(a == "--apply" or a.startswith("--apply=") for a in sys.argv[1:]):
+    sys.exit(run_headless(sys.argv[1:]))
+
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QStackedWidget, QMessageBox, QSizePolicy, QFrame,
-    QGraphicsOpacityEffect, QGraphicsProxyWidget, QTableWidget, QTableWidgetItem, QHeaderView,
-    QGraphicsOpacityEffect, QGraphicsProxyWidget, QTableWidget, QTableWidgetItem, QHeaderView,
-    QTextEdit, QLineEdit
+    QLabel, QStackedWidget, QMessageBox, QSizePolicy, QTableView, QHeaderView,
+    QTextEdit, QLineEdit, QAbstractScrollArea
 )
 from PyQt6.QtCore import (
-    QPoint, QParallelAnimationGroup, QRect, pyqtSignal, QPropertyAnimation, pyqtProperty
+    Qt, QUrl, QSize, QTimer, QBuffer, QByteArray, QEasingCurve, QPointF, QRect, QEvent,
+    pyqtSignal, QObject, QVariantAnimation, QAbstractTableModel, QModelIndex
 )
-from PyQt6.QtGui import QPixmap, QImage, QPainter, QColor, QPalette, QAction, QFont, QMouseEvent, QTransform
+from PyQt6.QtGui import QPixmap, QImage, QImageReader, QImageIOHandler, QPainter, QColor, QPalette, QFont, QFontMetrics, QMouseEvent, QTransform
 import csv
 import random
-import json
-from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
-from PyQt6.QtMultimediaWidgets import QVideoWidget
 
-# High DPI Support
-if hasattr(Qt.ApplicationAttribute, 'AA_EnableHighDpiScaling'):
-    QApplication.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
-if hasattr(Qt.ApplicationAttribute, 'AA_UseHighDpiPixmaps'):
-    QApplication.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
+# High DPI Support
+if hasattr(Qt.ApplicationAttribute, 'AA_EnableHighDpiScaling'):
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
+if hasattr(Qt.ApplicationAttribute, 'AA_UseHighDpiPixmaps'):
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
+
+# QtMultimedia and QtPdf are imported the first time a video or PDF comes up
+# (load_multimedia, load_pdf): starting the media backend alone takes longer
+# than putting the first image on screen.
+MULTIMEDIA_SUPPORT = True  # Until an import fails
+QMediaPlayer = QAudioOutput = QVideoSink = QVideoWidget = None
+PDF_SUPPORT = True
+QPdfDocument = QPdfView = NavigationPdfView = None
+_lazy_import_lock = threading.Lock()
+
+
+def load_multimedia():
+    """Import QtMultimedia on first use. Returns False if it is unavailable."""
+    global MULTIMEDIA_SUPPORT, QMediaPlayer, QAudioOutput, QVideoSink, QVideoWidget
+    if QMediaPlayer is not None:
+        return True
+    with _lazy_import_lock:
+        if QMediaPlayer is None and MULTIMEDIA_SUPPORT:
+            try:
+                from PyQt6 import QtMultimedia, QtMultimediaWidgets
+            except ImportError as e:
+                MULTIMEDIA_SUPPORT = False
+                print(f"Warning: PyQt6.QtMultimedia could not be loaded ({e}). Video playback disabled.")
+            else:
+                QAudioOutput, QVideoSink = QtMultimedia.QAudioOutput, QtMultimedia.QVideoSink
+                QVideoWidget = QtMultimediaWidgets.QVideoWidget
+                QMediaPlayer = QtMultimedia.QMediaPlayer
+    return QMediaPlayer is not None
+
+
+def load_pdf():
+    """Import QtPdf on first use; safe from any thread. Returns False if it is unavailable."""
+    global PDF_SUPPORT, QPdfDocument, QPdfView, NavigationPdfView
+    if QPdfDocument is not None:
+        return True
+    with _lazy_import_lock:
+        if QPdfDocument is None and PDF_SUPPORT:
+            try:
+                from PyQt6 import QtPdf, QtPdfWidgets
+            except ImportError:
+                PDF_SUPPORT = False
+                print("Warning: PyQt6.QtPdf not found. PDF support disabled.")
+            else:
+                QPdfView = QtPdfWidgets.QPdfView
+
+                class NavigationPdfView(QPdfView):
+                    def keyPressEvent(self, event):
+                        # Ignore navigation keys so they bubble up to the parent
+                        if event.key() in (Qt.Key.Key_Left, Qt.Key.Key_Right, Qt.Key.Key_A, Qt.Key.Key_D, Qt.Key.Key_Escape, Qt.Key.Key_R):
+                            event.ignore()
+                        else:
+                            super().keyPressEvent(event)
+
+                QPdfDocument = QtPdf.QPdfDocument
+    return QPdfDocument is not None
+
+
+class ImageWidget(QWidget):
+    """
+    A custom widget to display an image centered and scaled, maintaining aspect ratio.
+
+    The scaled pixmap is cached per target size. During a resize or a burst of
+    new images it is rescaled with FastTransformation, and redone smoothly once
+    things have been still for SMOOTH_DELAY_MS.
+    """
+    SMOOTH_DELAY_MS = 120
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pixmap = None
+        self._scaled = None
+        self._scaled_key = None  # (device size, smooth)
+        self._fast = False  # Inside a resize/navigation burst
+        self.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+        # Set background to black
+        pal = self.palette()
+        pal.setColor(QPalette.ColorRole.Window, Qt.GlobalColor.black)
+        self.setAutoFillBackground(True)
+        self.setPalette(pal)
+
+        self.smooth_timer = QTimer(self)
+        self.smooth_timer.setSingleShot(True)
+        self.smooth_timer.timeout.connect(self._settle)
+
+    def set_pixmap(self, pixmap, refine=False):
+        """
+        Show `pixmap`. With refine=True it is a better version of the image
+        already on screen (e.g. the full decode replacing an embedded
+        thumbnail), which does not count towards a navigation burst.
+        """
+        self.pixmap = pixmap
+        self._scaled = None
+        self._scaled_key = None
+        if pixmap is not None and not refine:
+            # A second image within the delay means the user is flicking through
+            self._fast = self._fast or self.smooth_timer.isActive()
+            self.smooth_timer.start(self.SMOOTH_DELAY_MS)
+        self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._fast = True
+        self.smooth_timer.start(self.SMOOTH_DELAY_MS)
+
+    def _settle(self):
+        if self._fast:
+            self._fast = False
+            self.update()
+
+    def _scaled_pixmap(self, w_widget, h_widget):
+        dpr = self.devicePixelRatioF()
+        box = QSize(round(w_widget * dpr), round(h_widget * dpr))
+        smooth = not self._fast
+        if self._scaled is not None and self._scaled_key[0] == box and (self._scaled_key[1] or not smooth):
+            return self._scaled
+
+        mode = Qt.TransformationMode.SmoothTransformation if smooth else Qt.TransformationMode.FastTransformation
+        self._scaled = self.pixmap.scaled(box, Qt.AspectRatioMode.KeepAspectRatio, mode)
+        self._scaled.setDevicePixelRatio(dpr)
+        self._scaled_key = (box, smooth)
+        return self._scaled
+
+    def paintEvent(self, event):
+        if not self.pixmap or self.pixmap.isNull():
+            return
+
+        # Calculate scaling to fit window while keeping aspect ratio
+        w_widget = self.width()
+        h_widget = self.height()
+        
+        if w_widget <= 0 or h_widget <= 0:
+            return
+
+        scaled_pixmap = self._scaled_pixmap(w_widget, h_widget)
+        size = scaled_pixmap.deviceIndependentSize()
+
+        # Center draw position
+        x = (w_widget - size.width()) / 2
+        y = (h_widget - size.height()) / 2
+        
+        painter = QPainter(self)
+        painter.drawPixmap(QPointF(x, y), scaled_pixmap)
+
+
+class TiffParser:
+    """
+    Minimal reader for TIFF-structured data (TIFF files, EXIF blocks, most RAW
+    containers). Only the IFD entries that are asked for are ever read.
+    """
+    TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8, 13: 4}
+    TYPE_FORMATS = {1: 'B', 3: 'H', 4: 'I', 6: 'b', 8: 'h', 9: 'i', 13: 'I'}
+
+    def __init__(self, f, base=0):
+        self.f = f
+        self.base = base
+        f.seek(base)
+        header = f.read(8)
+        if len(header) < 8 or header[:2] not in (b'II', b'MM'):
+            raise ValueError("not a TIFF structure")
+        self.endian = '<' if header[:2] == b'II' else '>'
+        self.first_ifd = struct.unpack(self.endian + 'I', header[4:8])[0]
+
+    def ifd(self, offset):
+        """Return ({tag: (type, count, raw 4-byte field)}, next IFD offset)."""
+        self.f.seek(self.base + offset)
+        raw = self.f.read(2)
+        if len(raw) < 2:
+            return {}, 0
+        count = struct.unpack(self.endian + 'H', raw)[0]
+        data = self.f.read(count * 12 + 4)
+        if len(data) < count * 12 + 4:
+            return {}, 0
+        entries = {}
+        for i in range(count):
+            tag, typ, n = struct.unpack(self.endian + 'HHI', data[i * 12:i * 12 + 8])
+            entries[tag] = (typ, n, data[i * 12 + 8:i * 12 + 12])
+        next_offset = struct.unpack(self.endian + 'I', data[-4:])[0]
+        return entries, next_offset
+
+    def values(self, entry):
+        """Decode the integer values of an IFD entry, following its offset if needed."""
+        typ, n, field = entry
+        fmt = self.TYPE_FORMATS.get(typ)
+        if fmt is None or n == 0 or n > 4096:
+            return ()
+        size = self.TYPE_SIZES[typ] * n
+        if size <= 4:
+            data = field[:size]
+        else:
+            self.f.seek(self.base + struct.unpack(self.endian + 'I', field)[0])
+            data = self.f.read(size)
+            if len(data) < size:
+                return ()
+        return struct.unpack(self.endian + fmt * n, data)
+
+    def value(self, entries, tag, default=None):
+        vals = self.values(entries[tag]) if tag in entries else ()
+        return vals[0] if vals else default
+
+    def text(self, entries, tag):
+        """Decode an ASCII entry, or return None."""
+        if tag not in entries:
+            return None
+        typ, n, field = entries[tag]
+        if typ != 2 or n > 4096:
+            return None
+        if n <= 4:
+            data = field[:n]
+        else:
+            self.f.seek(self.base + struct.unpack(self.endian + 'I', field)[0])
+            data = self.f.read(n)
+        return data.split(b'\x00', 1)[0].decode('ascii', 'replace').strip()
+
+
+EXIF_ORIENTATION = 0x0112
+TIFF_JPEG_OFFSET = 0x0201
+TIFF_JPEG_LENGTH = 0x0202
+
+
+def _jpeg_exif_block(f, limit=256 * 1024):
+    """Return the TIFF payload of a JPEG's APP1 Exif segment, reading only the header."""
+    if f.read(2) != b'\xff\xd8':
+        return None
+    pos = 2
+    while pos < limit:
+        marker = f.read(4)
+        if len(marker) < 4 or marker[0] != 0xFF:
+            return None
+        kind = marker[1]
+        length = struct.unpack('>H', marker[2:])[0]
+        if kind == 0xE1:
+            data = f.read(length - 2)
+            if data[:6] == b'Exif\x00\x00':
+                return data[6:]
+        elif kind in (0xDA, 0xD9):  # Start of scan: no more metadata
+            return None
+        else:
+            f.seek(length - 2, os.SEEK_CUR)
+        pos += 2 + length
+    return None
+
+
+def read_exif_thumbnail(path):
+    """
+    Return (jpeg_bytes, exif_orientation) for the thumbnail embedded in a JPEG
+    or TIFF file, or None. Only the file header is read, typically a few KB.
+    """
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(4)
+            f.seek(0)
+            if head[:2] == b'\xff\xd8':
+                block = _jpeg_exif_block(f)
+                if block is None:
+                    return None
+                tiff = TiffParser(io.BytesIO(block))
+            elif head[:2] in (b'II', b'MM'):
+                tiff = TiffParser(f)
+            else:
+                return None
+
+            ifd0, next_offset = tiff.ifd(tiff.first_ifd)
+            orientation = tiff.value(ifd0, EXIF_ORIENTATION, 1)
+            # The EXIF thumbnail lives in IFD1
+            if not next_offset:
+                return None
+            ifd1, _ = tiff.ifd(next_offset)
+            offset = tiff.value(ifd1, TIFF_JPEG_OFFSET)
+            length = tiff.value(ifd1, TIFF_JPEG_LENGTH)
+            if not offset or not length or length > 1024 * 1024:
+                return None
+            tiff.f.seek(tiff.base + offset)
+            data = tiff.f.read(length)
+            if data[:2] != b'\xff\xd8':
+                return None
+            return data, orientation
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def exif_transform(orientation):
+    """QTransform that turns an image stored with EXIF `orientation` upright."""
+    t = QTransform()
+    if orientation in (2, 4, 5, 7):
+        t.scale(-1, 1)
+    if orientation in (3, 4):
+        t.rotate(180)
+    elif orientation in (5, 6):
+        t.rotate(90)
+    elif orientation in (7, 8):
+        t.rotate(270)
+    return t
+
+
+def load_exif_thumbnail(path):
+    """Decode the embedded thumbnail of `path` upright, or return a null QImage."""
+    found = read_exif_thumbnail(path)
+    if found is None:
+        return QImage()
+    data, orientation = found
+    img = QImage.fromData(data)
+    if not img.isNull() and orientation not in (None, 1):
+        img = img.transformed(exif_transform(orientation))
+    return img
+
+
+RAW_EXTS = {'.cr2', '.cr3', '.nef', '.nrw', '.arw', '.srf', '.sr2', '.dng', '.raf', '.orf', '.rw2', '.pef', '.srw'}
+
+TIFF_COMPRESSION = 0x0103
+TIFF_STRIP_OFFSETS = 0x0111
+TIFF_STRIP_BYTE_COUNTS = 0x0117
+TIFF_SUB_IFDS = 0x014A
+RW2_JPEG_FROM_RAW = 0x002E
+
+
+def _tiff_raw_previews(f):
+    """Yield (offset, length) of every JPEG referenced from a TIFF-based RAW's IFD tree."""
+    tiff = TiffParser(f)
+    ifd0, _ = tiff.ifd(tiff.first_ifd)
+    orientation = tiff.value(ifd0, EXIF_ORIENTATION, 1)
+    candidates = []
+    todo = [tiff.first_ifd]
+    seen = set()
+    while todo and len(seen) < 32:
+        offset = todo.pop()
+        if not offset or offset in seen:
+            continue
+        seen.add(offset)
+        entries, next_offset = tiff.ifd(offset)
+        todo.append(next_offset)
+        todo.extend(tiff.values(entries[TIFF_SUB_IFDS]) if TIFF_SUB_IFDS in entries else ())
+
+        jpeg_offset = tiff.value(entries, TIFF_JPEG_OFFSET)
+        jpeg_length = tiff.value(entries, TIFF_JPEG_LENGTH)
+        if jpeg_offset and jpeg_length:
+            candidates.append((jpeg_offset, jpeg_length))
+        if tiff.value(entries, TIFF_COMPRESSION) in (6, 7):
+            strips = tiff.values(entries[TIFF_STRIP_OFFSETS]) if TIFF_STRIP_OFFSETS in entries else ()
+            counts = tiff.values(entries[TIFF_STRIP_BYTE_COUNTS]) if TIFF_STRIP_BYTE_COUNTS in entries else ()
+            if len(strips) == 1 and len(counts) == 1:
+                candidates.append((strips[0], counts[0]))
+        if RW2_JPEG_FROM_RAW in entries:
+            _, n, field = entries[RW2_JPEG_FROM_RAW]
+            candidates.append((struct.unpack(tiff.endian + 'I', field)[0], n))
+    return candidates, orientation
+
+
+def _iso_boxes(f, start, end):
+    """Yield (type, payload_start, box_end) for the ISOBMFF boxes in [start, end)."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(16)
+        if len(header) < 8:
+            return
+        size, kind = struct.unpack('>I4s', header[:8])
+        payload = pos + 8
+        if size == 1:
+            size = struct.unpack('>Q', header[8:16])[0]
+            payload = pos + 16
+        elif size == 0:
+            size = end - pos
+        if size < 8:
+            return
+        yield kind, payload, pos + size
+        pos += size
+
+
+CANON_CR3_UUID = bytes.fromhex('85c0b687820f11e08111f4ce462b6a48')
+
+
+def _cr3_raw_previews(f, file_size):
+    """Full-size JPEG of a CR3 (first track of the moov box) plus its CMT1 orientation."""
+    candidates = []
+    orientation = 1
+    for kind, payload, end in _iso_boxes(f, 0, file_size):
+        if kind != b'moov':
+            continue
+        for sub, sub_payload, sub_end in _iso_boxes(f, payload, end):
+            if sub == b'uuid':
+                f.seek(sub_payload)
+                if f.read(16) != CANON_CR3_UUID:
+                    continue
+                for meta, meta_payload, meta_end in _iso_boxes(f, sub_payload + 16, sub_end):
+                    if meta == b'CMT1':
+                        f.seek(meta_payload)
+                        try:
+                            tiff = TiffParser(io.BytesIO(f.read(meta_end - meta_payload)))
+                            ifd0, _ = tiff.ifd(tiff.first_ifd)
+                            orientation = tiff.value(ifd0, EXIF_ORIENTATION, 1)
+                        except (ValueError, struct.error):
+                            pass
+            elif sub == b'trak' and not candidates:
+                # trak > mdia > minf > stbl > (stsz, co64/stco)
+                box = (sub_payload, sub_end)
+                for name in (b'mdia', b'minf', b'stbl'):
+                    box = next(((p, e) for k, p, e in _iso_boxes(f, *box) if k == name), None)
+                    if box is None:
+                        break
+                if box is None:
+                    continue
+                offset = length = None
+                for k, p, e in _iso_boxes(f, *box):
+                    f.seek(p)
+                    data = f.read(min(e - p, 24))
+                    if k == b'stsz' and len(data) >= 12:
+                        sample_size, count = struct.unpack('>II', data[4:12])
+                        length = sample_size or (struct.unpack('>I', data[12:16])[0] if len(data) >= 16 else None)
+                    elif k == b'co64' and len(data) >= 16:
+                        offset = struct.unpack('>Q', data[8:16])[0]
+                    elif k == b'stco' and len(data) >= 12:
+                        offset = struct.unpack('>I', data[8:12])[0]
+                if offset and length:
+                    candidates.append((offset, length))
+        break
+    return candidates, orientation
+
+
+def find_raw_preview(path):
+    """
+    Locate the largest embedded JPEG preview of a camera RAW file without
+    demosaicing anything. Returns (offset, length, exif_orientation) or None.
+    Only container headers and JPEG SOF markers are read.
+    """
+    try:
+        file_size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            head = f.read(16)
+            if head.startswith(b'FUJIFILMCCD-RAW'):
+                f.seek(84)
+                offset, length = struct.unpack('>II', f.read(8))
+                candidates, orientation = [(offset, length)], None  # The JPEG carries its own EXIF
+            elif head[4:8] == b'ftyp':
+                candidates, orientation = _cr3_raw_previews(f, file_size)
+            elif head[:2] in (b'II', b'MM'):
+                candidates, orientation = _tiff_raw_previews(f)
+            else:
+                return None
+
+            best = None
+            for offset, length in candidates:
+                if offset + length > file_size or length < 1024:
+                    continue
+                dims = _jpeg_dimensions(f, offset)
+                if dims and (best is None or dims[0] * dims[1] > best[0]):
+                    best = (dims[0] * dims[1], offset, length)
+            if best is None:
+                return None
+            return best[1], best[2], orientation
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Error reading RAW container {path}: {e}")
+        return None
+
+
+def decode_image(path, target=None):
+    """
+    Decode an image file, downscaling inside the decoder when it is larger than
+    `target` (a QSize in device pixels). For JPEGs Qt turns the scaled size into
+    DCT-domain scaling, so a 50 MP file never exists at full size in memory.
+    """
+    orientation = None
+    if os.path.splitext(path)[1].lower() in RAW_EXTS:
+        preview = find_raw_preview(path)
+        if preview is None:
+            return QImage()
+        offset, length, orientation = preview
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            buf = QBuffer()
+            buf.setData(QByteArray(f.read(length)))
+        buf.open(QBuffer.OpenModeFlag.ReadOnly)
+        reader = QImageReader(buf, b"jpeg")
+    else:
+        reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    # RAW previews usually carry no EXIF of their own; use the container's orientation
+    if orientation not in (None, 1) and \
+            reader.transformation() == QImageIOHandler.Transformation.TransformationNone:
+        reader.setAutoTransform(False)
+    else:
+        orientation = None
+    if target is not None and target.isValid():
+        size = reader.size()
+        if size.isValid():
+            # The scaled size applies before EXIF rotation is undone
+            if reader.transformation() & QImageIOHandler.Transformation.TransformationRotate90 \
+                    or orientation in (5, 6, 7, 8):
+                target = target.transposed()
+            if size.width() > target.width() or size.height() > target.height():
+                reader.setScaledSize(size.scaled(target, Qt.AspectRatioMode.KeepAspectRatio))
+    img = reader.read()
+    if img.isNull():
+        print(f"Error decoding {path}: {reader.errorString()}")
+    elif orientation not in (None, 1):
+        img = img.transformed(exif_transform(orientation))
+    return img
+
+
+def render_pdf_page(path, target, page=0):
+    """Render one PDF page to fit `target` (device pixels). Safe to call off the GUI thread."""
+    if not load_pdf():
+        return QImage()
+    doc = QPdfDocument(None)
+    try:
+        doc.load(path)
+        if doc.status() != QPdfDocument.Status.Ready or doc.pageCount() <= page:
+            print(f"Error rendering {path}: {doc.error()}")
+            return QImage()
+        size = doc.pagePointSize(page).toSize().scaled(target, Qt.AspectRatioMode.KeepAspectRatio)
+        return doc.render(page, size)
+    finally:
+        doc.close()
+
+
+EXIF_IFD_POINTER = 0x8769
+EXIF_DATETIME_ORIGINAL = 0x9003
+EXIF_SUBSEC_ORIGINAL = 0x9291
+
+
+def read_exif_datetime(path):
+    """Capture time (DateTimeOriginal + sub-seconds) as a POSIX timestamp, or None."""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(2)
+            f.seek(0)
+            if head == b'\xff\xd8':
+                block = _jpeg_exif_block(f)
+                if block is None:
+                    return None
+                tiff = TiffParser(io.BytesIO(block))
+            elif head in (b'II', b'MM'):
+                tiff = TiffParser(f)
+            else:
+                return None
+            ifd0, _ = tiff.ifd(tiff.first_ifd)
+            exif_offset = tiff.value(ifd0, EXIF_IFD_POINTER)
+            if not exif_offset:
+                return None
+            exif, _ = tiff.ifd(exif_offset)
+            stamp = tiff.text(exif, EXIF_DATETIME_ORIGINAL)
+            if not stamp:
+                return None
+            ts = datetime.strptime(stamp, "%Y:%m:%d %H:%M:%S").timestamp()
+            subsec = tiff.text(exif, EXIF_SUBSEC_ORIGINAL)
+            if subsec and subsec.isdigit():
+                ts += int(subsec) / (10 ** len(subsec))
+            return ts
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def dhash_image(img):
+    """64-bit difference hash: brightness gradients of a 9x8 grayscale thumbnail."""
+    small = img.scaled(9, 8, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    small = small.convertToFormat(QImage.Format.Format_Grayscale8)
+    bits = 0
+    for y in range(8):
+        line = small.constScanLine(y)
+        line.setsize(9)
+        row = bytes(line)
+        for x in range(8):
+            bits = (bits << 1) | (row[x] > row[x + 1])
+    return bits
+
+
+def hash_image_file(path):
+    """
+    Process-pool worker: (path, size, mtime_ns, dhash or None, capture time).
+    Decodes at a tiny size, so JPEGs only pay for a 1/8 DCT-scaled decode.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (path, None, None, None, None)
+    img = decode_image(path, QSize(72, 64))
+    h = dhash_image(img) if not img.isNull() else None
+    ts = read_exif_datetime(path)
+    return (path, st.st_size, st.st_mtime_ns, h, ts if ts is not None else st.st_mtime)
+
+
+def cluster_bursts(items, max_distance=10, max_gap=2.0, window=10.0):
+    """
+    Group near-duplicate shots taken close together.
+
+    items: [(name, dhash, timestamp)]. Walking in capture order, each shot joins
+    the most similar recent cluster whose last shot is within `window` seconds
+    (or within `max_gap` of the previous shot for a continuing burst) and whose
+    hash is within `max_distance` bits. Returns clusters of 2+ names.
+    """
+    clusters = []  # [[names], last_ts, last_hash]
+    for name, h, ts in sorted(items, key=lambda item: (item[2], item[0])):
+        best = None
+        for cluster in reversed(clusters):
+            if ts - cluster[1] > window:
+                break
+            distance = bin(h ^ cluster[2]).count('1')
+            limit = max_distance if ts - cluster[1] <= max_gap else max_distance // 2
+            if distance <= limit and (best is None or distance < best[0]):
+                best = (distance, cluster)
+        if best is None:
+            clusters.append([[name], ts, h])
+        else:
+            best[1][0].append(name)
+            best[1][1] = ts
+            best[1][2] = h
+    return [c[0] for c in clusters if len(c[0]) > 1]
+
+
+class HashCache:
+    """Perceptual hashes and capture times by (path, size, mtime), shared across sessions."""
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, dhash INTEGER, ts REAL)")
+        self._conn.commit()
+
+    def get(self, path, st):
+        row = self._conn.execute("SELECT size, mtime_ns, dhash, ts FROM hashes WHERE path = ?", (path,)).fetchone()
+        if row is None or row[0] != st.st_size or row[1] != st.st_mtime_ns:
+            return None
+        return (row[2] & 0xFFFFFFFFFFFFFFFF, row[3])
+
+    def put_many(self, rows):
+        """rows: [(path, size, mtime_ns, dhash, ts)]"""
+        # SQLite integers are signed 64-bit
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)",
+            [(p, s, m, h - (1 << 64) if h >= 1 << 63 else h, t) for p, s, m, h, t in rows])
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+class ImageCache:
+    """
+    Byte-budgeted LRU cache of decoded images.
+
+    Keys are (path, mtime_ns, size, decode size), so a file that changed on disk
+    or a window that grew simply misses instead of serving stale pixels. Entries
+    are not tied to list positions, so deleting from the file list is harmless.
+    """
+    def __init__(self, budget_bytes):
+        self.budget = budget_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()  # {key: QImage}, least recently used first
+
+    @staticmethod
+    def key(path, decode_size):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (path, st.st_mtime_ns, st.st_size, (decode_size.width(), decode_size.height()))
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        img = self._items.get(key)
+        if img is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._items.move_to_end(key)
+        return img
+
+    def put(self, key, img):
+        cost = img.sizeInBytes()
+        if cost > self.budget:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.bytes -= old.sizeInBytes()
+        self._items[key] = img
+        self.bytes += cost
+        while self.bytes > self.budget:
+            _, evicted = self._items.popitem(last=False)
+            self.bytes -= evicted.sizeInBytes()
+            self.evictions += 1
+
+    def clear(self):
+        self._items.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            'entries': len(self._items), 'bytes': self.bytes, 'budget': self.budget,
+            'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+        }
+
+
+def user_cache_dir():
+    """Per-user cache directory for winnow (not inside the folder being culled)."""
+    if sys.platform == 'darwin':
+        base = os.path.expanduser("~/Library/Caches")
+    elif os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser("~/AppData/Local")
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser("~/.cache")
+    return os.path.join(base, "winnow")
+
+
+def file_fingerprint(path, st, chunk=16 * 1024):
+    """Cheap content fingerprint: size, mtime and a hash of the first and last `chunk` bytes."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+    with open(path, 'rb') as f:
+        h.update(f.read(chunk))
+        if st.st_size > 2 * chunk:
+            f.seek(-chunk, os.SEEK_END)
+            h.update(f.read(chunk))
+    return h.hexdigest()
+
+
+class PreviewStore:
+    """
+    On-disk cache of screen-sized, pre-encoded previews shared across sessions.
+
+    Previews are keyed by path, size and mtime, so finding one takes a stat
+    of the original but never a read (the point of the store on slow USB or
+    network storage). They are only written for images that had to be
+    downscaled (small images are cheaper to decode directly). File mtimes
+    double as LRU timestamps: reads touch them and pruning deletes the oldest
+    once the store exceeds its byte cap. Safe to use from several decode
+    threads at once.
+    """
+    def __init__(self, directory, budget_bytes):
+        self.directory = directory
+        self.budget = budget_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._bytes = None  # Measured lazily on the first write
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _preview_path(self, path, st):
+        digest = hashlib.blake2b(
+            f"{os.path.abspath(path)}\0{st.st_size}\0{st.st_mtime_ns}".encode(), digest_size=20).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + ".pv")
+
+    def load(self, path, target):
+        """Return a preview covering `target` (QSize), or None."""
+        try:
+            st = os.stat(path)
+            preview_path = self._preview_path(path, st)
+        except OSError:
+            return None
+        if not os.path.exists(preview_path):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        reader = QImageReader(preview_path)
+        reader.setDecideFormatFromContent(True)
+        size = reader.size()
+        # Too small for the current window: decode the original again
+        if not size.isValid() or (size.width() < target.width() - 1 and size.height() < target.height() - 1):
+            with self._lock:
+                self.misses += 1
+            return None
+        if size.width() > target.width() or size.height() > target.height():
+            reader.setScaledSize(size.scaled(target, Qt.AspectRatioMode.KeepAspectRatio))
+        img = reader.read()
+        if img.isNull():
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(preview_path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return img
+
+    def save(self, path, img):
+        try:
+            st = os.stat(path)
+            preview_path = self._preview_path(path, st)
+            os.makedirs(os.path.dirname(preview_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(preview_path), suffix=".tmp")
+            os.close(fd)
+            fmt = "PNG" if img.hasAlphaChannel() else "JPG"
+            if not img.save(tmp_path, fmt, 90):
+                os.remove(tmp_path)
+                return
+            os.replace(tmp_path, preview_path)
+            written = os.path.getsize(preview_path)
+        except OSError as e:
+            print(f"Error writing preview for {path}: {e}")
+            return
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = self._measure()
+            else:
+                self._bytes += written
+            if self._bytes > self.budget:
+                self._prune()
+
+    def _entries(self):
+        for sub in os.scandir(self.directory):
+            if sub.is_dir():
+                for entry in os.scandir(sub.path):
+                    if entry.name.endswith(".pv"):
+                        yield entry
+
+    def _measure(self):
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _prune(self):
+        """Delete least recently used previews until 90% of the budget is left."""
+        entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime)
+        for entry in entries:
+            if self._bytes <= self.budget * 0.9:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self._bytes -= size
+            except OSError:
+                pass
+
+
+VIDEO_EXTS = ('.mp4', '.mov', '.avi', '.mkv', '.webm')
+
+
+class DecodePool(QObject):
+    """
+    Decodes images (and the first page of PDFs) on background threads,
+    nearest-to-cursor first.
+
+    Jobs are ImageCache keys, so each one carries the path and the size to
+    decode to. schedule() replaces the whole wanted set, so jobs that fell out
+    of the lookahead window (e.g. while an arrow key is held down) are dropped
+    before a worker ever picks them up.
+    """
+    decoded = pyqtSignal(object, QImage)  # cache key, image (null on failure)
+
+    def __init__(self, workers=2, previews=None, parent=None):
+        super().__init__(parent)
+        self.previews = previews  # Optional PreviewStore consulted before the original
+        self._cond = threading.Condition()
+        self._heap = []       # [(priority, seq, key)]
+        self._wanted = {}     # {key: priority}
+        self._running = set()
+        self._seq = itertools.count()
+        self._closed = False
+        for _ in range(workers):
+            threading.Thread(target=self._worker, daemon=True).start()
+
+    def schedule(self, jobs):
+        """jobs: iterable of (key, priority). Lower priority runs first."""
+        with self._cond:
+            self._wanted = {key: prio for key, prio in jobs if key not in self._running}
+            # Drop stale heap entries once they start to dominate
+            if len(self._heap) > 4 * len(self._wanted) + 64:
+                self._heap = []
+            for key, prio in self._wanted.items():
+                heapq.heappush(self._heap, (prio, next(self._seq), key))
+            self._cond.notify_all()
+
+    def cancel(self):
+        self.schedule([])
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            self._wanted = {}
+            self._heap = []
+            self._cond.notify_all()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._closed and not self._heap:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                prio, _, key = heapq.heappop(self._heap)
+                if self._wanted.get(key) != prio:
+                    continue  # Cancelled or re-prioritised
+                del self._wanted[key]
+                self._running.add(key)
+            try:
+                img = self._decode(key[0], QSize(*key[3]))
+            except Exception as e:
+                print(f"Error decoding {key[0]}: {e}")
+                img = QImage()
+            finally:
+                with self._cond:
+                    self._running.discard(key)
+            if not self._closed:
+                self.decoded.emit(key, img)
+
+    def _decode(self, path, target):
+        if self.previews is not None:
+            img = self.previews.load(path, target)
+            if img is not None:
+                return img
+        if path.lower().endswith(VIDEO_EXTS):
+            # Video posters are captured during playback and only ever come from the store
+            return QImage()
+        if path.lower().endswith('.pdf'):
+            img = render_pdf_page(path, target)
+        else:
+            img = decode_image(path, target)
+        # Only downscaled decodes are worth keeping on disk
+        if self.previews is not None and not img.isNull() and \
+                (img.width() >= target.width() - 1 or img.height() >= target.height() - 1):
+            self.previews.save(path, img)
+        return img
+
+
+class PdfLoader(QObject):
+    """
+    Opens QPdfDocuments on a background thread and hands them to the GUI
+    thread, so parsing a large scanned PDF never blocks navigation.
+
+    One worker, one pending path: start() replaces whatever has not been
+    picked up yet, so flicking through PDFs parses at most the one in
+    progress and the latest.
+    """
+    loaded = pyqtSignal(int, object)  # generation, QPdfDocument
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.generation = 0  # documents from older generations are stale
+        self._cond = threading.Condition()
+        self._pending = None  # (generation, path)
+        self._gui_thread = self.thread()
+        threading.Thread(target=self._worker, daemon=True).start()
+
+    def start(self, path):
+        with self._cond:
+            self.generation += 1
+            self._pending = (self.generation, path)
+            self._cond.notify()
+
+    def cancel(self):
+        with self._cond:
+            self.generation += 1
+            self._pending = None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                generation, path = self._pending
+                self._pending = None
+            if generation != self.generation or not load_pdf():
+                continue
+            doc = QPdfDocument(None)
+            doc.load(path)
+            # A stale document is dropped here, on the thread it was made on
+            if generation == self.generation:
+                doc.moveToThread(self._gui_thread)
+                self.loaded.emit(generation, doc)
+            del doc
+
+
+class VideoDeck(QObject):
+    """
+    A QMediaPlayer with its own audio output and video widget. MediaCuller
+    keeps two: the one on screen and a muted one parked on the first frame of
+    the next video, so switching to it is just a swap. Each deck reports the
+    first frame of what it opens, for use as a poster.
+    """
+    first_frame = pyqtSignal(str, QImage)  # path, frame
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.path = None
+        self.player = QMediaPlayer(self)
+        self.audio_output = QAudioOutput(self)
+        self.player.setAudioOutput(self.audio_output)
+        self.widget = QVideoWidget()
+        self.player.setVideoOutput(self.widget)
+        self._sink = self.widget.videoSink()
+        self._watching = False
+
+    def open(self, path, muted=False):
+        self.path = path
+        self.audio_output.setMuted(muted)
+        self.player.setSource(QUrl.fromLocalFile(path))
+        self._watch(True)
+
+    def release(self):
+        """Stop and close the file (so it can be moved)."""
+        self._watch(False)
+        self.path = None
+        self.player.stop()
+        self.player.setSource(QUrl())
+
+    def _watch(self, on):
+        # Only listen until the first frame; a Python slot per frame is not free
+        if self._sink is None or on == self._watching:
+            return
+        if on:
+            self._sink.videoFrameChanged.connect(self._on_frame)
+        else:
+            self._sink.videoFrameChanged.disconnect(self._on_frame)
+        self._watching = on
+
+    def _on_frame(self, frame):
+        if self.path is None or not frame.isValid():
+            return
+        img = frame.toImage()
+        if img.isNull():
+            return
+        self._watch(False)
+        self.first_frame.emit(self.path, img)
+
+
+FILMSTRIP_FRAMES = 10
+FILMSTRIP_MIN_MS = 2 * 60 * 1000  # shorter videos are quicker to just watch
+FILMSTRIP_HEIGHT = 90
+
+
+class FilmstripExtractor(QObject):
+    """
+    Grabs FILMSTRIP_FRAMES evenly spaced frames from a long video with its own
+    muted, never-shown player: seek, wait for the QVideoSink to deliver that
+    frame, repeat. Decoding happens in the media backend, so the GUI thread
+    only sees one signal per frame. Finished strips are cached on disk as one
+    JPEG per file fingerprint.
+    """
+    frame_ready = pyqtSignal(str, int, QImage)  # path, slot, frame
+    strip_ready = pyqtSignal(str, list)  # path, [QImage] from the disk cache
+    START_DELAY_MS = 300  # don't spin up a decoder for videos that are flicked past
+    SEEK_TIMEOUT_MS = 3000
+
+    def __init__(self, cache_dir, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.path = None
+        self._cache_file = None
+        self._positions = []
+        self._frames = []
+        self._slot = -1
+        self.player = QMediaPlayer(self)
+        self.audio_output = QAudioOutput(self)
+        self.audio_output.setMuted(True)
+        self.player.setAudioOutput(self.audio_output)
+        self.sink = QVideoSink(self)
+        self.player.setVideoOutput(self.sink)
+        self.sink.videoFrameChanged.connect(self._on_frame)
+        self.player.mediaStatusChanged.connect(self._on_status)
+        self.start_timer = QTimer(self)
+        self.start_timer.setSingleShot(True)
+        self.start_timer.timeout.connect(self._open)
+        self.seek_timer = QTimer(self)
+        self.seek_timer.setSingleShot(True)
+        self.seek_timer.timeout.connect(self._next)  # no frame for this slot; skip it
+
+    def start(self, path):
+        self.cancel()
+        try:
+            self._cache_file = os.path.join(self.cache_dir, file_fingerprint(path, os.stat(path)) + ".jpg")
+        except OSError:
+            return
+        strip = QImage(self._cache_file)
+        if not strip.isNull():
+            w = strip.width() // FILMSTRIP_FRAMES
+            self.strip_ready.emit(path, [strip.copy(i * w, 0, w, strip.height()) for i in range(FILMSTRIP_FRAMES)])
+            return
+        self.path = path
+        self.start_timer.start(self.START_DELAY_MS)
+
+    def cancel(self):
+        """Stop extracting and close the file (so it can be moved)."""
+        self.start_timer.stop()
+        self.seek_timer.stop()
+        self.path = None
+        self._slot = -1
+        self.player.stop()
+        self.player.setSource(QUrl())
 
-try:
-    from PyQt6.QtPdf import QPdfDocument
-    from PyQt6.QtPdfWidgets import QPdfView
-    PDF_SUPPORT = True
+    def _open(self):
+        if self.path is not None:
+            self.player.setSource(QUrl.fromLocalFile(self.path))
 
-    class NavigationPdfView(QPdfView):
-        def keyPressEvent(self, event):
-            # Ignore navigation keys so they bubble up to the parent
-            if event.key() in (Qt.Key.Key_Left, Qt.Key.Key_Right, Qt.Key.Key_A, Qt.Key.Key_D, Qt.Key.Key_Escape, Qt.Key.Key_R):
-                event.ignore()
-            else:
-                super().keyPressEvent(event)
-except ImportError:
-    PDF_SUPPORT = False
-    print("Warning: PyQt6.QtPdf not found. PDF support disabled.")
+    def _on_status(self, status):
+        if self.path is None or self._slot >= 0:
+            return
+        if status == QMediaPlayer.MediaStatus.LoadedMedia:
+            duration = self.player.duration()
+            if duration < FILMSTRIP_MIN_MS:
+                self.cancel()
+                return
+            self._positions = [duration * (2 * i + 1) // (2 * FILMSTRIP_FRAMES) for i in range(FILMSTRIP_FRAMES)]
+            self._frames = [None] * FILMSTRIP_FRAMES
+            self._next()
+        elif status == QMediaPlayer.MediaStatus.InvalidMedia:
+            self.cancel()
 
+    def _next(self):
+        if self.path is None:
+            return
+        self._slot += 1
+        if self._slot >= FILMSTRIP_FRAMES:
+            self._finish()
+            return
+        self.player.setPosition(self._positions[self._slot])
+        self.player.pause()
+        self.seek_timer.start(self.SEEK_TIMEOUT_MS)
 
+    def _on_frame(self, frame):
+        if self.path is None or not 0 <= self._slot < FILMSTRIP_FRAMES or not frame.isValid():
+            return
+        # Frames from before the seek can still be in flight; keyframe seeks land near, not on, the target
+        start_ms = frame.startTime() // 1000
+        if frame.startTime() >= 0 and abs(start_ms - self._positions[self._slot]) > 10000:
+            return
+        img = frame.toImage()
+        if img.isNull():
+            return
+        img = img.scaledToHeight(2 * FILMSTRIP_HEIGHT, Qt.TransformationMode.SmoothTransformation)  # 2x for HiDPI
+        self._frames[self._slot] = img
+        self.seek_timer.stop()
+        self.frame_ready.emit(self.path, self._slot, img)
+        # Seek again from the event loop, not from inside the backend's signal
+        QTimer.singleShot(0, self._next)
 
-class ImageWidget(QWidget):
+    def _finish(self):
+        frames = self._frames
+        cache_file = self._cache_file
+        self.cancel()
+        if any(f is None for f in frames):
+            return  # incomplete; try again next time
+        w, h = frames[0].width(), frames[0].height()
+        strip = QImage(w * len(frames), h, QImage.Format.Format_RGB32)
+        painter = QPainter(strip)
+        for i, frame in enumerate(frames):
+            painter.drawImage(QRect(i * w, 0, w, h), frame)
+        painter.end()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            strip.save(cache_file, "JPEG", 85)
+        except OSError as e:
+            print(f"Could not cache filmstrip: {e}")
+
+
+class MoveQueue(QObject):
     """
-    A custom widget to display an image centered and scaled, maintaining aspect ratio.
+    Moves files on a single background thread, in submission order.
+
+    The target directory is created and the collision-safe destination picked
+    on the worker, so a slow or cross-filesystem move never blocks the GUI.
+    Each job's status is tracked until it completes.
+    """
+    move_finished = pyqtSignal(int, str, str, str)  # job id, src, dst, error ('' on success)
+    move_progress = pyqtSignal(int, str, 'qint64', 'qint64')  # job id, src, bytes done, total
+    pending_changed = pyqtSignal(int)
+
+    QUEUED, MOVING, DONE, FAILED = 'queued', 'moving', 'done', 'failed'
+
+    def __init__(self, verify=False, parent=None):
+        super().__init__(parent)
+        self.verify = verify  # Checksum cross-filesystem copies before deleting the source
+        self.status = {}  # {job id: status}
+        self._jobs = queue.Queue()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pending = 0
+        threading.Thread(target=self._worker, daemon=True).start()
+
+    def submit(self, src, target_dir):
+        return self.submit_group([src], target_dir)[0]
+
+    def submit_group(self, srcs, target_dir):
+        """Queue several moves into one directory, which is created only once. Returns their job ids."""
+        job_ids = [next(self._ids) for _ in srcs]
+        with self._lock:
+            for job_id in job_ids:
+                self.status[job_id] = self.QUEUED
+            self._pending += len(job_ids)
+            pending = self._pending
+        self._jobs.put((list(zip(job_ids, srcs)), target_dir))
+        self.pending_changed.emit(pending)
+        return job_ids
+
+    def pending(self):
+        with self._lock:
+            return self._pending
+
+    def _worker(self):
+        while True:
+            jobs, target_dir = self._jobs.get()
+            dir_error = ''
+            try:
+                os.makedirs(target_dir, exist_ok=True)
+            except Exception as e:
+                dir_error = str(e) or e.__class__.__name__
+            for job_id, src in jobs:
+                with self._lock:
+                    self.status[job_id] = self.MOVING
+                dst = ''
+                error = dir_error
+                if not error:
+                    try:
+                        dst = unique_destination(target_dir, os.path.basename(src))
+                        move_path(src, dst, verify=self.verify,
+                                  progress=lambda done, total, j=job_id, s=src: self.move_progress.emit(j, s, done, total))
+                    except Exception as e:
+                        error = str(e) or e.__class__.__name__
+                with self._lock:
+                    self.status[job_id] = self.FAILED if error else self.DONE
+                    self._pending -= 1
+                    pending = self._pending
+                self.move_finished.emit(job_id, src, dst, error)
+                self.pending_changed.emit(pending)
+
+
+class DecisionJournal:
+    """
+    Append-only JSON-lines journal of decisions made in --deferred mode.
+
+    Nothing touches the files until the decisions are applied, so replaying the
+    journal after a crash restores exactly the uncommitted (and not yet moved)
+    decisions. Records: decide, undo, done (a move completed).
+    """
+    def __init__(self, path):
+        self.path = path
+        self._f = None
+
+    def load(self):
+        """Replay the journal into the list of outstanding decisions (dicts, oldest first)."""
+        decisions = []
+        if not os.path.exists(self.path):
+            return decisions
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line after a crash
+                    op = rec.pop('op', None)
+                    if op == 'decide':
+                        decisions.append(rec)
+                    elif op == 'undo' and decisions and decisions[-1]['name'] == rec.get('name'):
+                        decisions.pop()
+                    elif op == 'done':
+                        for i, d in enumerate(decisions):
+                            if d['name'] == rec.get('name'):
+                                del decisions[i]
+                                break
+        except OSError as e:
+            print(f"Error reading journal: {e}")
+        return decisions
+
+    def append(self, op, **fields):
+        try:
+            if self._f is None:
+                self._f = open(self.path, 'a', encoding='utf-8')
+            fields['op'] = op
+            self._f.write(json.dumps(fields) + "\n")
+            self._f.flush()
+        except OSError as e:
+            print(f"Error writing journal: {e}")
+
+    def sync(self):
+        if self._f is not None:
+            try:
+                os.fsync(self._f.fileno())
+            except OSError:
+                pass
+
+    def clear(self):
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error removing journal: {e}")
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+class DirectoryScanner(QObject):
+    """
+    Lists a directory on a background thread with os.scandir.
+
+    Accepted names are handed over in sorted batches that start small and
+    grow geometrically, so the first item can be shown long before a huge
+    listing (or a slow network share) finishes, while the total cost of
+    merging the batches stays O(n log n).
     """
+    batch_ready = pyqtSignal(int, list)      # generation, sorted names
+    finished = pyqtSignal(int, int, int)     # generation, entries seen, entries skipped as viewed
+
+    FIRST_BATCH = 64
+    MAX_BATCH = 65536
+    FLUSH_INTERVAL = 0.1  # Seconds; keeps slow listings trickling in
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.pixmap = None
-        self.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
-        # Set background to black
-        pal = self.palette()
-        pal.setColor(QPalette.ColorRole.Window, Qt.GlobalColor.black)
-        self.setAutoFillBackground(True)
-        self.setPalette(pal)
+        self.generation = 0
+        self._cancelled = threading.Event()
 
-    def set_pixmap(self, pixmap):
-        self.pixmap = pixmap
-        self.update()
+    def start(self, directory, is_candidate, is_viewed):
+        """is_candidate(name) and is_viewed(dir_entry) are called on the worker thread."""
+        self.cancel()
+        self.generation += 1
+        self._cancelled = threading.Event()
+        threading.Thread(target=self._run, args=(self.generation, self._cancelled, directory, is_candidate, is_viewed),
+                         daemon=True).start()
 
-    def paintEvent(self, event):
-        if not self.pixmap or self.pixmap.isNull():
+    def cancel(self):
+        self._cancelled.set()
+
+    def _run(self, generation, cancelled, directory, is_candidate, is_viewed):
+        batch = []
+        batch_size = self.FIRST_BATCH
+        seen = 0
+        skipped = 0
+        last_flush = time.monotonic()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if cancelled.is_set():
+                        return
+                    name = entry.name
+                    if not is_winnow_file(name):
+                        seen += 1
+                    if not is_candidate(name):
+                        continue
+                    if is_viewed(entry):
+                        skipped += 1
+                        continue
+                    batch.append(name)
+                    if len(batch) >= batch_size or time.monotonic() - last_flush > self.FLUSH_INTERVAL:
+                        batch.sort()
+                        self.batch_ready.emit(generation, batch)
+                        batch = []
+                        batch_size = min(batch_size * 2, self.MAX_BATCH)
+                        last_flush = time.monotonic()
+        except OSError as e:
+            print(f"Error scanning directory: {e}")
+        if cancelled.is_set():
             return
+        if batch:
+            batch.sort()
+            self.batch_ready.emit(generation, batch)
+        self.finished.emit(generation, seen, skipped)
 
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
 
-        # Calculate scaling to fit window while keeping aspect ratio
-        w_widget = self.width()
-        h_widget = self.height()
-        
-        if w_widget <= 0 or h_widget <= 0:
+class BurstGrouper(QObject):
+    """
+    Hashes every image in a folder on a process pool (one worker per core),
+    reusing cached hashes, then clusters bursts and near-duplicates.
+    Runs from a coordinator thread so the GUI never waits on it.
+    """
+    progress = pyqtSignal(int, int)  # hashed, total
+    clusters_ready = pyqtSignal(list)  # [[names]]
+
+    def __init__(self, cache_path, parent=None):
+        super().__init__(parent)
+        self.cache_path = cache_path
+        self._cancelled = threading.Event()
+
+    def start(self, directory, names):
+        self.cancel()
+        self._cancelled = threading.Event()
+        threading.Thread(target=self._run, args=(self._cancelled, directory, list(names)), daemon=True).start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _run(self, cancelled, directory, names):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            cache = HashCache(self.cache_path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Burst grouping disabled: {e}")
             return
+        items = []
+        todo = []
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                cached = cache.get(path, os.stat(path))
+            except OSError:
+                continue
+            if cached is not None:
+                items.append((name, cached[0], cached[1]))
+            else:
+                todo.append(path)
 
-        scaled_pixmap = self.pixmap.scaled(
-            QSize(w_widget, h_widget),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
+        total = len(names)
+        done = total - len(todo)
+        self.progress.emit(done, total)
+        fresh = []
+        if todo:
+            try:
+                self._hash_in_pool(cancelled, todo, total, done, items, fresh)
+            except (OSError, BrokenProcessPool) as e:
+                print(f"Burst grouping incomplete: {e}")
+            if fresh:
+                cache.put_many(fresh)
+        cache.close()
+        if cancelled.is_set():
+            return
+        self.progress.emit(total, total)
+        self.clusters_ready.emit(cluster_bursts(items))
 
-        # Center draw position
-        x = (w_widget - scaled_pixmap.width()) // 2
-        y = (h_widget - scaled_pixmap.height()) // 2
-        
-        painter.drawPixmap(x, y, scaled_pixmap)
+    def _hash_in_pool(self, cancelled, todo, total, done, items, fresh):
+        # spawn: forking a process that runs Qt threads is unsafe
+        workers = os.cpu_count() or 2
+        chunksize = max(1, min(32, len(todo) // (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            last_emit = time.monotonic()
+            for path, size, mtime_ns, h, ts in pool.map(hash_image_file, todo, chunksize=chunksize):
+                if cancelled.is_set():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    return
+                done += 1
+                if h is not None:
+                    items.append((os.path.basename(path), h, ts))
+                    fresh.append((path, size, mtime_ns, h, ts))
+                if time.monotonic() - last_emit > 0.5:
+                    self.progress.emit(done, total)
+                    last_emit = time.monotonic()
+
+
+DUP_EDGE = 64 * 1024
+
+
+def _edge_digest(path, size, chunk=DUP_EDGE):
+    """Hash of the first and last `chunk` bytes (the whole file when it is small)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        h.update(f.read(chunk))
+        if size > chunk:
+            f.seek(max(chunk, size - chunk))
+            h.update(f.read(chunk))
+    return h.digest()
+
+
+def find_duplicates(directory, names, cancelled=None, workers=4):
+    """
+    Byte-identical files among `names`: {redundant name: name of the copy to keep}.
+
+    Files are bucketed by size, then by a hash of their first and last 64 KB;
+    only larger files that still collide are hashed in full. At most `workers`
+    files are read at once. The shortest name in a group is the one kept, so
+    `report.pdf` wins over `report (1).pdf`.
+    """
+    by_size = {}
+    for name in names:
+        try:
+            st = os.lstat(os.path.join(directory, name))
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode) and st.st_size > 0:
+            by_size.setdefault(st.st_size, {}).setdefault((st.st_dev, st.st_ino), name)  # hard links are one file
+    groups = [[(name, size) for name in inodes.values()] for size, inodes in by_size.items() if len(inodes) > 1]
+
+    def split(groups, digest):
+        """Refine each group by digest(path, size), dropping files that no longer collide."""
+        flat = [(i, name, size) for i, group in enumerate(groups) for name, size in group]
+
+        def read(item):
+            _, name, size = item
+            try:
+                return digest(os.path.join(directory, name), size)
+            except OSError:
+                return None
+
+        buckets = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for (i, name, size), d in zip(flat, pool.map(read, flat)):
+                if cancelled is not None and cancelled.is_set():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    return []
+                if d is not None:
+                    buckets.setdefault((i, d), []).append((name, size))
+        return [group for group in buckets.values() if len(group) > 1]
+
+    groups = split(groups, _edge_digest)
+    # Edge hashes already cover every byte of files up to 2 * DUP_EDGE
+    exact = [group for group in groups if group[0][1] <= 2 * DUP_EDGE]
+    exact += split([group for group in groups if group[0][1] > 2 * DUP_EDGE],
+                   lambda path, size: _file_digest(path))
+
+    duplicates = {}
+    for group in exact:
+        keep, *rest = sorted((name for name, _ in group), key=lambda name: (len(name), name))
+        for name in rest:
+            duplicates[name] = keep
+    return duplicates
+
+
+class DuplicateFinder(QObject):
+    """Runs find_duplicates() off the GUI thread."""
+    duplicates_ready = pyqtSignal(dict)  # {redundant name: name kept}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cancelled = threading.Event()
+
+    def start(self, directory, names):
+        self.cancel()
+        self._cancelled = threading.Event()
+        threading.Thread(target=self._run, args=(self._cancelled, directory, list(names)), daemon=True).start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _run(self, cancelled, directory, names):
+        duplicates = find_duplicates(directory, names, cancelled)
+        if not cancelled.is_set():
+            self.duplicates_ready.emit(duplicates)
+
+
+CSV_INDEX_CHUNK = 1024 * 1024
+CSV_FIRST_CHUNK = 256 * 1024
+
+
+def _scan_csv_rows(buf, base, in_quotes, ends):
+    """
+    Append the file offset just past every row-ending newline in `buf` (read from
+    offset `base`) to `ends`. Newlines inside quoted fields are skipped by tracking
+    quote parity ("" escapes toggle twice). Returns whether `buf` ends inside quotes.
+    """
+    lines = buf.split(b'\n')
+    tail = lines.pop()
+    if not in_quotes and b'"' not in buf:
+        ends.extend(base + n for n in itertools.accumulate(len(line) + 1 for line in lines))
+        return False
+    pos = base
+    for line in lines:
+        pos += len(line) + 1
+        if line.count(b'"') & 1:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            ends.append(pos)
+    return in_quotes != bool(tail.count(b'"') & 1)
+
+
+class CsvTableModel(QAbstractTableModel):
+    """
+    A CSV file that is never loaded whole. Rows are located through a byte-offset
+    index that grows as the file is scanned, and parsed only when the view asks
+    for them. The first row is the header.
+    """
+    ROW_CACHE = 2048
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self._file = open(path, 'rb')
+        self._bounds = array('q', [0])  # row i spans bounds[i]:bounds[i + 1]
+        self._rows = OrderedDict()  # {row: [fields]}, parsed rows LRU
+        self.header = []
+
+    def close(self):
+        self._file.close()
+
+    def read_head(self, size):
+        """The first `size` bytes of the file, to index the first screen inline."""
+        self._file.seek(0)
+        return self._file.read(size)
+
+    def add_row_ends(self, ends):
+        if not ends:
+            return
+        if not self.header:
+            self.beginResetModel()
+            self._bounds.extend(ends)
+            self.header = self._parse(0) or ['']
+            self.endResetModel()
+            return
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(ends) - 1)
+        self._bounds.extend(ends)
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else max(0, len(self._bounds) - 2)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.header)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.header[section] if section < len(self.header) else None
+        return str(section + 1)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        row = self._rows.get(index.row())
+        if row is None:
+            row = self._parse(index.row() + 1)
+            self._rows[index.row()] = row
+            if len(self._rows) > self.ROW_CACHE:
+                self._rows.popitem(last=False)
+        else:
+            self._rows.move_to_end(index.row())
+        return row[index.column()] if index.column() < len(row) else None
+
+    def _parse(self, i):
+        start, end = self._bounds[i], self._bounds[i + 1]
+        try:
+            self._file.seek(start)
+            text = self._file.read(end - start).decode('utf-8', errors='replace')
+        except (OSError, ValueError):
+            return []
+        try:
+            return next(csv.reader([text]), [])
+        except csv.Error:
+            return text.rstrip('\r\n').split(',')
 
 
 class CsvWidget(QWidget):
+    """CSV table that shows the first screen at once and indexes the rest in the background."""
+    _rows_indexed = pyqtSignal(int, object)  # generation, [row end offsets]
+    _index_finished = pyqtSignal(int, 'qint64')  # generation, file size
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
-        self.table = QTableWidget()
+        self.table = QTableView()
         self.table.setStyleSheet("background-color: #111; color: #eee; gridline-color: #444;")
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        # Uniform row heights keep the header O(1) with millions of rows
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(24)
         self.layout.addWidget(self.table)
+        self.status = QLabel("")
+        self.status.setStyleSheet("color: #888; font-size: 11px;")
+        self.layout.addWidget(self.status)
+        self.model = None
+        self.path = None  # File on show
+        self._generation = 0
+        self._cancelled = threading.Event()
+        self._rows_indexed.connect(self._on_rows_indexed)
+        self._index_finished.connect(self._on_index_finished)
+
+    def clear(self):
+        """Stop indexing and close the file (so it can be moved)."""
+        self._generation += 1
+        self._cancelled.set()
+        self.table.setModel(None)
+        if self.model is not None:
+            self.model.close()
+            self.model.deleteLater()
+            self.model = None
+        self.path = None
+        self.status.setText("")
 
     def load_csv(self, path):
-        self.table.clear()
-        self.table.setRowCount(0)
-        self.table.setColumnCount(0)
+        self.clear()
+        self.path = path
         try:
-            with open(path, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                rows = list(reader)
-                if not rows: return
-                
-                self.table.setColumnCount(len(rows[0]))
-                self.table.setRowCount(len(rows))
-                
-                for i, row in enumerate(rows):
-                    for j, val in enumerate(row):
-                        self.table.setItem(i, j, QTableWidgetItem(val))
-        except Exception as e:
+            self.model = CsvTableModel(path, self)
+            head = self.model.read_head(CSV_FIRST_CHUNK)
+        except OSError as e:
             print(f"Error reading CSV: {e}")
+            return
+        ends = []
+        in_quotes = _scan_csv_rows(head, 0, in_quotes=False, ends=ends)
+        self.model.add_row_ends(ends)
+        self.table.setModel(self.model)
+        if len(head) < CSV_FIRST_CHUNK:
+            self._on_index_finished(self._generation, len(head))
+            return
+        self._cancelled = threading.Event()
+        self.status.setText(f"{self.model.rowCount():,} rows (indexing...)")
+        threading.Thread(target=self._index, daemon=True,
+                         args=(self._generation, self._cancelled, path, len(head), in_quotes)).start()
 
+    def _index(self, generation, cancelled, path, offset, in_quotes):
+        ends = []
+        last_emit = time.monotonic()
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                while not cancelled.is_set():
+                    buf = f.read(CSV_INDEX_CHUNK)
+                    if not buf:
+                        break
+                    in_quotes = _scan_csv_rows(buf, offset, in_quotes, ends)
+                    offset += len(buf)
+                    if ends and time.monotonic() - last_emit > 0.1:
+                        self._rows_indexed.emit(generation, ends)
+                        ends = []
+                        last_emit = time.monotonic()
+        except OSError as e:
             print(f"Error reading CSV: {e}")
+        if cancelled.is_set():
+            return
+        self._rows_indexed.emit(generation, ends)
+        self._index_finished.emit(generation, offset)
+
+    def _on_rows_indexed(self, generation, ends):
+        if generation != self._generation or self.model is None:
+            return
+        self.model.add_row_ends(ends)
+        self.status.setText(f"{self.model.rowCount():,} rows (indexing...)")
+
+    def _on_index_finished(self, generation, size):
+        if generation != self._generation or self.model is None:
+            return
+        if self.model._bounds[-1] < size:
+            # Last row has no trailing newline
+            self.model.add_row_ends([size])
+        self.status.setText(f"{self.model.rowCount():,} rows")
 
 
 class NavigationTextEdit(QTextEdit):
     def keyPressEvent(self, event):
         # Ignore navigation keys so they bubble up to the parent (MediaCuller)
-        if event.key() in (Qt.Key.Key_Left, Qt.Key.Key_Right, Qt.Key.Key_A, Qt.Key.Key_D, Qt.Key.Key_Escape, Qt.Key.Key_R):
+        if event.key() in (Qt.Key.Key_Left, Qt.Key.Key_Right, Qt.Key.Key_A, Qt.Key.Key_D, Qt.Key.Key_Escape, Qt.Key.Key_R, Qt.Key.Key_Space):
             event.ignore()
         else:
             super().keyPressEvent(event)
 
+
+TEXT_FULL_LIMIT = 256 * 1024  # smaller files are shown whole
+TEXT_HEAD_BYTES = 64 * 1024
+TEXT_TAIL_BYTES = 16 * 1024
+TEXT_INDEX_BLOCK = 1024 * 1024
+TEXT_LINE_SEARCH = 1024 * 1024  # how far back to look for a line start
+
+
+class PagedTextView(QAbstractScrollArea):
+    """
+    Virtual view of a memory-mapped text file. Only the lines on screen are
+    decoded; the position is a byte offset, so opening and jumping anywhere in
+    a multi-GB file costs the same. Lines longer than the view are wrapped.
+    """
+    topChanged = pyqtSignal('qint64')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet("background-color: #111; color: #eee; border: none;")
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        font = QFont("monospace")
+        font.setStyleHint(QFont.StyleHint.Monospace)
+        font.setPixelSize(14)
+        self.setFont(font)
+        self.viewport().setFont(font)
+        self.mm = None
+        self.size = 0
+        self.top = 0
+        self._wheel_accum = 0  # Trackpad deltas below one step, kept for the next event
+        self.verticalScrollBar().valueChanged.connect(self._on_scrollbar)
+
+    def set_source(self, mm):
+        self.mm = mm
+        self.size = len(mm) if mm is not None else 0
+        self.top = 0
+        # Scrollbars are int; scale byte offsets into range
+        bar = self.verticalScrollBar()
+        bar.blockSignals(True)
+        bar.setRange(0, min(self.size, 1 << 30))
+        bar.setValue(0)
+        bar.blockSignals(False)
+        self.viewport().update()
+
+    def _metrics(self):
+        fm = QFontMetrics(self.viewport().font())
+        cols = max(16, (self.viewport().width() - 8) // max(1, fm.horizontalAdvance('M')))
+        rows = max(1, self.viewport().height() // fm.lineSpacing())
+        return fm, cols, rows
+
+    def _line_start(self, pos):
+        floor = max(0, pos - TEXT_LINE_SEARCH)
+        nl = self.mm.rfind(b'\n', floor, pos)
+        return nl + 1 if nl >= 0 else floor
+
+    def _next_segment(self, pos, cols):
+        nl = self.mm.find(b'\n', pos, min(self.size, pos + cols + 1))
+        return nl + 1 if nl >= 0 else min(self.size, pos + cols)
+
+    def _prev_segment(self, pos, cols):
+        if pos <= 0:
+            return 0
+        start = self._line_start(pos - 1)
+        return start + (pos - 1 - start) // cols * cols
+
+    def scroll_segments(self, n):
+        if self.mm is None:
+            return
+        _, cols, _ = self._metrics()
+        pos = self.top
+        for _ in range(abs(n)):
+            nxt = self._next_segment(pos, cols) if n > 0 else self._prev_segment(pos, cols)
+            if nxt >= self.size:
+                break
+            pos = nxt
+        self._set_top(pos)
+
+    def _set_top(self, pos, sync_bar=True):
+        self.top = pos
+        if sync_bar and self.size:
+            bar = self.verticalScrollBar()
+            bar.blockSignals(True)
+            bar.setValue(pos * bar.maximum() // self.size)
+            bar.blockSignals(False)
+        self.viewport().update()
+        self.topChanged.emit(pos)
+
+    def _on_scrollbar(self, value):
+        if self.mm is None:
+            return
+        bar = self.verticalScrollBar()
+        self._set_top(self._line_start(value * self.size // max(1, bar.maximum())), sync_bar=False)
+
+    def paintEvent(self, event):
+        if self.mm is None:
+            return
+        painter = QPainter(self.viewport())
+        painter.setPen(QColor("#eee"))
+        fm, cols, rows = self._metrics()
+        pos = self.top
+        y = fm.ascent()
+        for _ in range(rows + 1):
+            if pos >= self.size:
+                break
+            end = self._next_segment(pos, cols)
+            line = self.mm[pos:end].decode('utf-8', errors='replace').rstrip('\r\n').expandtabs(4)
+            painter.drawText(4, y, line)
+            y += fm.lineSpacing()
+            pos = end
+        painter.end()
+
+    def keyPressEvent(self, event):
+        _, _, rows = self._metrics()
+        key = event.key()
+        if key == Qt.Key.Key_Down:
+            self.scroll_segments(1)
+        elif key == Qt.Key.Key_Up:
+            self.scroll_segments(-1)
+        elif key == Qt.Key.Key_PageDown:
+            self.scroll_segments(rows - 1)
+        elif key == Qt.Key.Key_PageUp:
+            self.scroll_segments(-(rows - 1))
+        elif key == Qt.Key.Key_Home:
+            self._set_top(0)
+        elif key == Qt.Key.Key_End:
+            self._set_top(self._line_start(self.size))
+            self.scroll_segments(-(rows - 1))
+        else:
+            # Everything else bubbles up to the parent (MediaCuller)
+            event.ignore()
+
+    def wheelEvent(self, event):
+        # Truncate toward zero and carry the rest, so both directions scroll alike
+        self._wheel_accum += -event.angleDelta().y()
+        steps = int(self._wheel_accum / 40)
+        self._wheel_accum -= steps * 40
+        if steps:
+            self.scroll_segments(steps)
+
+
 class TextWidget(QWidget):
+    """
+    Small files are shown whole. Larger ones open instantly as head + tail, read
+    through mmap; Space (or clicking the note) browses the whole file in a paged
+    view while a background thread counts lines block by block.
+    """
+    _lines_counted = pyqtSignal(int, object)  # generation, [newlines up to the end of each block]
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
+        self.views = QStackedWidget()
         self.text_edit = NavigationTextEdit()
         self.text_edit.setReadOnly(True)
         self.text_edit.setStyleSheet("background-color: #111; color: #eee; font-family: monospace; font-size: 14px; border: none;")
-        self.layout.addWidget(self.text_edit)
+        self.views.addWidget(self.text_edit)
+        self.paged_view = PagedTextView()
+        self.paged_view.topChanged.connect(self._update_status)
+        self.views.addWidget(self.paged_view)
+        self.layout.addWidget(self.views)
+        self.status = ClickableLabel("")
+        self.status.setStyleSheet("color: #888; font-size: 11px;")
+        self.status.clicked.connect(self.toggle_full)
+        self.status.hide()
+        self.layout.addWidget(self.status)
+
+        self.path = None  # File on show
+        self._file = None
+        self._mm = None
+        self._generation = 0
+        self._cancelled = threading.Event()
+        # Newlines before each TEXT_INDEX_BLOCK boundary, filled in as they are counted
+        self._line_index = array('q', [0])
+        self._lines_counted.connect(self._on_lines_counted)
+
+    def clear(self):
+        """Stop counting and unmap the file (so it can be moved)."""
+        self._generation += 1
+        self._cancelled.set()
+        self.paged_view.set_source(None)
+        self.views.setCurrentWidget(self.text_edit)
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.path = None
+        self.status.hide()
 
     def load_text(self, path):
+        self.clear()
+        self.path = path
         try:
-            with open(path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-                self.text_edit.setPlainText(content)
+            size = os.path.getsize(path)
+            if size <= TEXT_FULL_LIMIT:
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    self.text_edit.setPlainText(f.read())
+                return
+            self._file = open(path, 'rb')
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
         except Exception as e:
+            self.clear()
+            self.path = path
             self.text_edit.setPlainText(f"Error reading file:\n{e}")
+            return
+
+        mm = self._mm
+        head_end = mm.rfind(b'\n', 0, TEXT_HEAD_BYTES) + 1 or TEXT_HEAD_BYTES
+        tail_start = mm.find(b'\n', size - TEXT_TAIL_BYTES) + 1 or size - TEXT_TAIL_BYTES
+        skipped = tail_start - head_end
+        self.text_edit.setPlainText(
+            mm[:head_end].decode('utf-8', errors='replace')
+            + f"\n··· {format_size(skipped)} not shown ···\n\n"
+            + mm[tail_start:].decode('utf-8', errors='replace'))
+        self.status.setText(f"Head and tail of {format_size(size)} • Space to browse the whole file")
+        self.status.show()
+
+        self._line_index = array('q', [0])
+        self._cancelled = threading.Event()
+        threading.Thread(target=self._count_lines, daemon=True,
+                         args=(self._generation, self._cancelled, path)).start()
+
+    def toggle_full(self):
+        if self._mm is None:
+            return
+        if self.views.currentWidget() is self.paged_view:
+            self.views.setCurrentWidget(self.text_edit)
+            self.status.setText(f"Head and tail of {format_size(len(self._mm))} • Space to browse the whole file")
+            return
+        self.paged_view.set_source(self._mm)
+        self.views.setCurrentWidget(self.paged_view)
+        self.paged_view.setFocus()
+        self._update_status()
+
+    def _count_lines(self, generation, cancelled, path):
+        # Own handle: the mmap may be closed under us when the user moves on
+        lines = 0
+        counts = []
+        last_emit = time.monotonic()
+        try:
+            with open(path, 'rb') as f:
+                while not cancelled.is_set():
+                    block = f.read(TEXT_INDEX_BLOCK)
+                    if not block:
+                        break
+                    lines += block.count(b'\n')
+                    counts.append(lines)
+                    if time.monotonic() - last_emit > 0.2:
+                        self._lines_counted.emit(generation, counts)
+                        counts = []
+                        last_emit = time.monotonic()
+        except OSError:
+            return
+        if not cancelled.is_set():
+            self._lines_counted.emit(generation, counts)
+
+    def _on_lines_counted(self, generation, counts):
+        if generation != self._generation:
+            return
+        self._line_index.extend(counts)
+        self._update_status()
+
+    def line_at(self, offset):
+        """1-based line number at a byte offset, or None while that block is still being counted."""
+        block = offset // TEXT_INDEX_BLOCK
+        if self._mm is None or block >= len(self._line_index):
+            return None
+        return self._line_index[block] + self._mm[block * TEXT_INDEX_BLOCK:offset].count(b'\n') + 1
+
+    def _update_status(self, *_):
+        if self._mm is None or self.views.currentWidget() is not self.paged_view:
+            return
+        size = len(self._mm)
+        line = self.line_at(self.paged_view.top)
+        where = f"Line {line:,}" if line is not None else f"{100 * self.paged_view.top // size}%"
+        lines = self._line_index[-1]
+        if (len(self._line_index) - 1) * TEXT_INDEX_BLOCK < size:
+            total = f"of {lines:,}+ lines (counting)"
+        else:
+            if self._mm[-1:] != b'\n':
+                lines += 1
+            total = f"of {lines:,} lines"
+        self.status.setText(f"{where} {total} • Space for head and tail")
+
+
+FOLDER_PREVIEW_NAMES = 10
+FOLDER_SUMMARY_BUDGET = 5.0  # seconds of walking before settling for a partial total
+FOLDER_SUMMARY_TTL = 60.0  # seconds a finished summary is reused
+
+
+class FolderSummarizer(QObject):
+    """
+    Summarizes a folder off the GUI thread: the first names in sorted order
+    (partial selection, not a full sort), then the recursive size, file count
+    and type breakdown, streamed as the walk goes. Walks stop after
+    FOLDER_SUMMARY_BUDGET seconds. Finished summaries are cached per (inode,
+    mtime) for FOLDER_SUMMARY_TTL seconds; the folder's mtime only covers its
+    own entries, so changes deeper in the tree show up once the entry expires.
+    Walks cut short by the budget are never cached.
+    """
+    listing_ready = pyqtSignal(int, list, int, bool)  # generation, first names, entries, complete
+    totals_ready = pyqtSignal(int, dict)  # generation, summary (see _walk)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.generation = 0  # results from older generations are stale
+        self._cancelled = threading.Event()
+        self._cache = {}  # {(dev, ino, mtime_ns): (time cached, listing, summary)}
+
+    def start(self, path):
+        self.cancel()
+        generation = self.generation
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        key = (st.st_dev, st.st_ino, st.st_mtime_ns) if st else None
+        cached = self._cache.get(key)
+        if cached and time.monotonic() - cached[0] < FOLDER_SUMMARY_TTL:
+            self.listing_ready.emit(generation, *cached[1])
+            self.totals_ready.emit(generation, cached[2])
+            return
+        self._cancelled = threading.Event()
+        threading.Thread(target=self._run, args=(generation, self._cancelled, path, key), daemon=True).start()
+
+    def cancel(self):
+        self._cancelled.set()
+        self.generation += 1
+
+    def _run(self, generation, cancelled, path, key):
+        deadline = time.monotonic() + FOLDER_SUMMARY_BUDGET
+        try:
+            listing = self._list(path, cancelled, deadline)
+        except OSError as e:
+            self.totals_ready.emit(generation, {'error': str(e)})
+            return
+        if cancelled.is_set():
+            return
+        self.listing_ready.emit(generation, *listing)
+        summary = self._walk(path, generation, cancelled, deadline)
+        if cancelled.is_set():
+            return
+        self.totals_ready.emit(generation, summary)
+        if key is not None and listing[2] and summary['complete']:
+            self._cache[key] = (time.monotonic(), listing, summary)
+
+    def _list(self, path, cancelled, deadline):
+        count = 0
+
+        def names():
+            nonlocal count
+            with os.scandir(path) as it:
+                for entry in it:
+                    if cancelled.is_set() or time.monotonic() > deadline:
+                        return
+                    count += 1
+                    yield entry.name
+
+        first = heapq.nsmallest(FOLDER_PREVIEW_NAMES, names())
+        return (first, count, not cancelled.is_set() and time.monotonic() <= deadline)
+
+    def _walk(self, path, generation, cancelled, deadline):
+        """Recursive totals: {'size', 'files', 'folders', 'types': {ext: [files, bytes]}, 'complete'}."""
+        summary = {'size': 0, 'files': 0, 'folders': 0, 'types': {}, 'complete': False}
+        stack = [path]
+        last_emit = time.monotonic()
+        while stack:
+            if cancelled.is_set() or time.monotonic() > deadline:
+                return summary
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            summary['folders'] += 1
+                            stack.append(entry.path)
+                            continue
+                        size = entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+                    summary['files'] += 1
+                    summary['size'] += size
+                    ext = os.path.splitext(entry.name)[1].lower() or '(none)'
+                    counts = summary['types'].setdefault(ext, [0, 0])
+                    counts[0] += 1
+                    counts[1] += size
+            if time.monotonic() - last_emit > 0.2:
+                self.totals_ready.emit(generation, {**summary, 'types': dict(summary['types']), 'running': True})
+                last_emit = time.monotonic()
+        summary['complete'] = True
+        return summary
 
 
 class GenericFileWidget(QWidget):
@@ -175,34 +2764,117 @@ class GenericFileWidget(QWidget):
         self.details_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.layout.addWidget(self.details_label)
 
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("color: #8be9fd; font-size: 14px; margin-top: 10px;")
+        self.summary_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.layout.addWidget(self.summary_label)
+
+        self.summarizer = FolderSummarizer(self)
+        self.summarizer.listing_ready.connect(self._on_listing)
+        self.summarizer.totals_ready.connect(self._on_totals)
+
         # Preload icons
         base_path = os.path.dirname(os.path.abspath(__file__))
         self.icon_file = QPixmap(os.path.join(base_path, "img", "file.png")).scaled(64, 64, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
         self.icon_folder = QPixmap(os.path.join(base_path, "img", "folder.png")).scaled(64, 64, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
 
     def set_item(self, path, name, is_dir):
+        self.cancel()
+        self.summary_label.setText("")
         if is_dir:
             self.icon_label.setPixmap(self.icon_folder)
             self.name_label.setText(name)
-            
-            try:
-                items = os.listdir(path)
-                items.sort()
-                count = len(items)
-                shown_items = items[:10]
-                details_text = "\n".join(shown_items)
-                if count > 10:
-                    details_text += f"\n... and {count - 10} more"
-                if count == 0:
-                    details_text = "(Empty Folder)"
-                self.details_label.setText(details_text)
-            except Exception as e:
-                self.details_label.setText(f"Error reading folder: {e}")
+            self.details_label.setText("Reading folder...")
+            self.summarizer.start(path)
         else:
             self.icon_label.setPixmap(self.icon_file)
             self.name_label.setText(name)
             self.details_label.setText("Unknown File Type")
 
+    def cancel(self):
+        """Stop summarizing (on navigating away)."""
+        self.summarizer.cancel()
+
+    def _on_listing(self, generation, names, count, complete):
+        if generation != self.summarizer.generation:
+            return
+        if count == 0:
+            self.details_label.setText("(Empty Folder)")
+            return
+        details_text = "\n".join(names)
+        more = count - len(names)
+        if more > 0 or not complete:
+            details_text += f"\n... and {more:,}{'+' if not complete else ''} more"
+        self.details_label.setText(details_text)
+
+    def _on_totals(self, generation, summary):
+        if generation != self.summarizer.generation:
+            return
+        if 'error' in summary:
+            self.details_label.setText(f"Error reading folder: {summary['error']}")
+            return
+        if not summary['files'] and not summary['folders']:
+            return
+        partial = '' if summary['complete'] else '+'
+        text = (f"{format_size(summary['size'])}{partial} in {summary['files']:,}{partial} files"
+                f", {summary['folders']:,}{partial} subfolders")
+        biggest = sorted(summary['types'].items(), key=lambda item: -item[1][1])[:4]
+        if biggest:
+            text += "\n" + " • ".join(f"{ext} {format_size(size)} ({files:,})" for ext, (files, size) in biggest)
+        if summary.get('running'):
+            text += "\n(counting...)"
+        elif not summary['complete']:
+            text += f"\n(stopped after {FOLDER_SUMMARY_BUDGET:.0f} s)"
+        self.summary_label.setText(text)
+
+
+class FilmstripWidget(QWidget):
+    """Row of evenly spaced frames under the player; clicking one asks to seek there."""
+    slot_clicked = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFixedHeight(FILMSTRIP_HEIGHT)
+        self.frames = []
+        self.hide()
+
+    def reset(self):
+        self.frames = []
+        self.hide()
+
+    def set_frames(self, frames):
+        self.frames = list(frames)
+        self.show()
+        self.update()
+
+    def set_frame(self, slot, img):
+        if len(self.frames) != FILMSTRIP_FRAMES:
+            self.frames = [None] * FILMSTRIP_FRAMES
+        self.frames[slot] = img
+        self.show()
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#000"))
+        if not self.frames:
+            return
+        slot_w = self.width() / len(self.frames)
+        for i, img in enumerate(self.frames):
+            cell = QRect(int(i * slot_w) + 1, 0, int(slot_w) - 2, self.height())
+            if img is None:
+                painter.fillRect(cell, QColor("#222"))
+                continue
+            size = img.size().scaled(cell.size(), Qt.AspectRatioMode.KeepAspectRatio)
+            target = QRect(cell.x() + (cell.width() - size.width()) // 2,
+                           (cell.height() - size.height()) // 2, size.width(), size.height())
+            painter.drawImage(target, img)
+        painter.end()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton and self.frames:
+            self.slot_clicked.emit(min(len(self.frames) - 1, int(event.position().x() * len(self.frames) / self.width())))
+
 
 class ClickableLabel(QLabel):
     clicked = pyqtSignal()
@@ -224,8 +2896,7 @@ class QuoteWidget(QLabel):
         super().__init__(parent)
         self.setStyleSheet("color: #666; font-style: italic; font-size: 12px; padding: 10px;")
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.quotes = []
-        self._load_quotes()
+        self.quotes = None  # Read on the first refresh, not at startup
         
     def _load_quotes(self):
         try:
@@ -239,6 +2910,8 @@ class QuoteWidget(QLabel):
             self.quotes = [("The code must go on.", "Anonymous")]
 
     def refresh_quote(self):
+        if self.quotes is None:
+            self._load_quotes()
         if not self.quotes: return
         q, a = random.choice(self.quotes)
         self.setText(f'"{q}" — {a}')
@@ -320,72 +2993,142 @@ class FlagWidget(QWidget):
         else:
             super().keyPressEvent(event)
 
-class RotatableLabel(QLabel):
+class NotificationLabel(QLabel):
+    """Non-modal message that floats over the bottom of its parent and fades away."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet("background-color: rgba(40, 0, 0, 220); color: #ff8888; font-size: 13px; "
+                           "padding: 8px 14px; border-radius: 6px;")
+        self.setWordWrap(True)
+        self.hide_timer = QTimer(self)
+        self.hide_timer.setSingleShot(True)
+        self.hide_timer.timeout.connect(self.hide)
+        self.hide()
+
+    def notify(self, text, timeout_ms=5000):
+        self.setText(text)
+        parent = self.parentWidget()
+        width = min(600, parent.width() - 40)
+        self.setFixedWidth(max(width, 100))
+        self.adjustSize()
+        self.move((parent.width() - self.width()) // 2, parent.height() - self.height() - 20)
+        self.show()
+        self.raise_()
+        self.hide_timer.start(timeout_ms)
+
+
+class TransitionOverlay(QWidget):
+    """
+    Snapshot of the outgoing view, animated by painting: offset, rotation and
+    opacity are applied in paintEvent, with no QGraphicsOpacityEffect. One
+    overlay is reused for every transition; starting a new one replaces the
+    one in flight instead of stacking another on top.
+    """
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._rotation = 0.0
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.pixmap = None
+        self.target = QRect()  # where the snapshot starts, in our coordinates
+        self._end = (0, 0, 0.0)  # dx, dy, rotation at the end
+        self._progress = 0.0
+        self.anim = QVariantAnimation(self)
+        self.anim.setStartValue(0.0)
+        self.anim.setEndValue(1.0)
+        self.anim.valueChanged.connect(self._set_progress)
+        self.anim.finished.connect(self._finish)
+        self.hide()
 
-    @pyqtProperty(float)
-    def rotation(self):
-        return self._rotation
+    def start(self, pixmap, target, dx, dy, rotation=0.0, duration=250, easing=QEasingCurve.Type.InQuad):
+        self.anim.stop()
+        self.pixmap = pixmap
+        self.target = target
+        self._end = (dx, dy, rotation)
+        self._progress = 0.0
+        self.setGeometry(self.parentWidget().rect())
+        self.anim.setDuration(duration)
+        self.anim.setEasingCurve(easing)
+        self.show()
+        self.anim.start()
 
-    @rotation.setter
-    def rotation(self, angle):
-        self._rotation = angle
+    def _set_progress(self, value):
+        self._progress = value
         self.update()
 
+    def _finish(self):
+        self.hide()
+        self.pixmap = None
+
     def paintEvent(self, event):
-        if not self.pixmap() or self.pixmap().isNull():
+        if self.pixmap is None:
             return
-        
+        p = self._progress
+        dx, dy, rotation = self._end
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-        
-        # Rotate around center
-        w, h = self.width(), self.height()
-        center = QPoint(w // 2, h // 2)
-        
-        painter.translate(center)
-        painter.rotate(self._rotation)
+        painter.setOpacity(1.0 - p)
+        center = QPointF(self.target.center())
+        painter.translate(center + QPointF(dx * p, dy * p))
+        painter.rotate(rotation * p)
         painter.translate(-center)
-        
-        # Draw normally
-        # We need to draw the pixmap exactly as QLabel would (scaled contents are tricky here)
-        # But our overlay sets pixmap exactly.
-        # However, QLabel usually centers. 
-        # For the overlay, we grabbed the stack, so it matches widget size.
-        
-        # Standard draw
-        x = (w - self.pixmap().width()) // 2
-        y = (h - self.pixmap().height()) // 2
-        painter.drawPixmap(x, y, self.pixmap())
+        # The snapshot is low resolution; stretching it is fine while it moves and fades
+        painter.drawPixmap(self.target, self.pixmap)
+        painter.end()
 
 
 class MediaCuller(QMainWindow):
-    def __init__(self, directory):
+    def __init__(self, directory, preload_ahead=4, preload_behind=1, cache_mb=512, preview_cache_mb=1024,
+                 deferred=False, verify_moves=False, bursts=False, turbo=False):
         super().__init__()
+        self.turbo = turbo  # No transitions at all
         self.directory = os.path.abspath(directory)
         self.rejected_dir = os.path.join(self.directory, "_rejected") # Keep strict reject folder? 
         # User wants flags instead. We'll use the flag folders.
-        self.log_file = os.path.join(self.directory, ".winnow_log") # Move log to hidden file in dir
+        self.log_file = os.path.join(self.directory, ".winnow_log.db") # Move log to hidden file in dir
+        self.legacy_log_file = os.path.join(self.directory, ".winnow_log")
         
-        self.config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "flags.json")
+        self.config_file = FLAGS_FILE
         self.flags = self._load_flags()
 
-        # Load Viewed Log
-        self.viewed_files = self._load_log()
+        # Load Viewed Log (buffered; flushed in groups and at least once a second)
+        self.viewed_log = self._load_log()
+        self.log_flush_timer = QTimer()
+        self.log_flush_timer.timeout.connect(self.viewed_log.flush)
+        self.log_flush_timer.start(1000)
+
+        # Burst grouping (perceptual hashes on a process pool, started once the scan is done)
+        self.bursts_enabled = bursts
+        self.cluster_of = {}  # {name: [names in its cluster]}
+        self._hash_progress = None  # (done, total) while hashing
+        self.burst_grouper = BurstGrouper(os.path.join(user_cache_dir(), "hashes.db"), self)
+        self.burst_grouper.progress.connect(self._on_hash_progress)
+        self.burst_grouper.clusters_ready.connect(self._on_clusters_ready)
+
+        # Exact duplicates (found after the scan, off the GUI thread)
+        self.duplicate_of = {}  # {redundant name: name kept}
+        self.duplicate_finder = DuplicateFinder(self)
+        self.duplicate_finder.duplicates_ready.connect(self._on_duplicates_ready)
+
+        # Deferred mode: decisions are journaled and applied in one pass on commit/exit
+        self.journal = DecisionJournal(os.path.join(self.directory, ".winnow_journal"))
+        self.decisions = self.journal.load()  # [{'name', 'action', 'target', 'index'}]
+        self._decided_names = {d['name'] for d in self.decisions}
+        self._applying = set()  # Names handed to the move queue by a commit
+        self.deferred = deferred or bool(self.decisions)
+        if self.decisions:
+            print(f"Restored {len(self.decisions)} uncommitted decisions from {os.path.basename(self.journal.path)}.")
 
         # Supported Extensions
         self.image_exts = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.tiff'}
-        self.video_exts = {'.mp4', '.mov', '.avi', '.mkv', '.webm'}
-        self.pdf_exts = {'.pdf'} if PDF_SUPPORT else set()
+        self.raw_exts = set(RAW_EXTS)  # Shown via their embedded JPEG preview
+        self.video_exts = set(VIDEO_EXTS)
+        self.pdf_exts = {'.pdf'}
         self.csv_exts = {'.csv'}
         self.txt_exts = {'.txt', '.md', '.log', '.json', '.xml', '.py', '.js', '.html', '.css'}
         
-        # Scan files
-        self.files = self._scan_directory()
+        # Scan files (streamed in by DirectoryScanner once the window exists)
+        self.files = []
         self.current_index = 0
+        self._scan_done = False
+        self._waiting_for_scan = False  # Cursor ran past the items found so far
         
         # Double Esc Logic
         self.esc_pending = False
@@ -397,9 +3140,27 @@ class MediaCuller(QMainWindow):
         self.files_processed_since_quote = 0
         self.next_quote_threshold = max(3, int(random.gauss(5, 1))) # Initial threshold
         
-        # Simple Cache for 1-ahead preload
-        self._preload_cache = {}  # {index: QImage}
+        # Background decoding of the lookahead window
+        self.preload_ahead = preload_ahead
+        self.preload_behind = preload_behind
+        self.image_cache = ImageCache(cache_mb * 1024 * 1024)
+        self._decode_failed = set()  # Cache keys that could not be decoded
+        self._pending_image_path = None  # Image on screen that is still decoding
+        self._decode_size = QSize()  # Device-pixel box images are decoded to fit
+        self.preview_store = None
+        if preview_cache_mb > 0:
+            try:
+                self.preview_store = PreviewStore(os.path.join(user_cache_dir(), "previews"),
+                                                  preview_cache_mb * 1024 * 1024)
+            except OSError as e:
+                print(f"Preview cache disabled: {e}")
+        self.decode_pool = DecodePool(workers=max(1, min(4, (os.cpu_count() or 2) - 1)),
+                                      previews=self.preview_store, parent=self)
+        self.decode_pool.decoded.connect(self._on_image_decoded)
+        self.pdf_loader = PdfLoader(self)
+        self.pdf_loader.loaded.connect(self._on_pdf_loaded)
         self.current_pdf_doc = None  # Hold reference for PDF document
+        self._shown_pdf_doc = None  # The one on the PDF view, kept (closed) until the next replaces it
 
         # Setup GUI
         self.setWindowTitle("winnow")
@@ -408,6 +3169,11 @@ class MediaCuller(QMainWindow):
         self.setMinimumSize(400, 300)
         self.drag_pos = None # For dragging functionality
         
+        # Re-decode at a higher resolution once a resize settles
+        self.resize_timer = QTimer()
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.timeout.connect(self._update_decode_size)
+        
         # Main container with layout to hold header and stack
         central_widget = QWidget()
         central_widget.setStyleSheet("background-color: black;")
@@ -444,6 +3210,20 @@ class MediaCuller(QMainWindow):
         self.lbl_filename.setAlignment(Qt.AlignmentFlag.AlignCenter)
         center_layout.addWidget(self.lbl_filename)
         
+        # Burst / duplicate info for the current file
+        self.lbl_badge = QLabel("")
+        self.lbl_badge.setStyleSheet("color: #8be9fd; font-size: 11px;")
+        self.lbl_badge.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.lbl_badge.hide()
+        center_layout.addWidget(self.lbl_badge)
+        
+        # Pending background moves
+        self.lbl_pending = QLabel("")
+        self.lbl_pending.setStyleSheet("color: #888; font-size: 11px;")
+        self.lbl_pending.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.lbl_pending.hide()
+        center_layout.addWidget(self.lbl_pending)
+        
         # Flags (Tiny)
         flags_container = QWidget()
         flags_layout = QHBoxLayout(flags_container)
@@ -473,7 +3253,12 @@ class MediaCuller(QMainWindow):
         hint_widget = QWidget()
         hint_layout = QHBoxLayout(hint_widget)
         hint_layout.setContentsMargins(0, 0, 0, 5)
-        self.lbl_hint = QLabel("Left/Right to Reject/Keep • A/S/D/F to Sort • esc to finish")
+        self.hint_text = "Left/Right to Reject/Keep • A/S/D/F to Sort • esc to finish"
+        if self.deferred:
+            self.hint_text = "Left/Right to Reject/Keep • A/S/D/F to Sort • Cmd+Z to undo • Cmd+S to apply • esc to finish"
+        if bursts:
+            self.hint_text = self.hint_text.replace(" • esc", " • K to keep best of burst • esc")
+        self.lbl_hint = QLabel(self.hint_text)
         self.lbl_hint.setStyleSheet("color: #444; font-size: 10px; font-style: italic;")
         self.lbl_hint.setAlignment(Qt.AlignmentFlag.AlignCenter)
         hint_layout.addWidget(self.lbl_hint)
@@ -488,115 +3273,202 @@ class MediaCuller(QMainWindow):
         self.stack_layout.addWidget(self.stack)
         
         self.main_layout.addWidget(self.stack_container, stretch=1)
+        self.overlay = TransitionOverlay(self.stack_container)
+        
+        # Held or mashed Right presses are queued and applied as one jump
+        self._queued_keeps = 0
+        self.input_timer = QTimer(self)
+        self.input_timer.setSingleShot(True)
+        self.input_timer.timeout.connect(self._flush_input)
         
         # --- Footer Quote (Visible) ---
         self.quote_label = QuoteWidget()
         self.main_layout.addWidget(self.quote_label)
         # self.quote_label.hide() # Do not hide initially, let load_media decide/or show default
         self.quote_label.show() # Force show as requested "persist at bottom"
-        self.quote_label.refresh_quote() # Initial quote
+        # The initial quote is picked once the first file is on screen
+        
+        # Move failures show up here instead of a modal dialog
+        self.notification = NotificationLabel(self.stack_container)
+        
+        # Background file moves (keep/reject/sort never wait on the disk)
+        self._close_when_idle = False
+        self._move_progress = None  # (src, done, total) of a large copy in flight
+        self.move_queue = MoveQueue(verify=verify_moves, parent=self)
+        self.move_queue.move_finished.connect(self._on_move_finished)
+        self.move_queue.move_progress.connect(self._on_move_progress)
+        self.move_queue.pending_changed.connect(self._on_moves_pending)
+        self._update_pending_label()
         
         # Image View
         self.image_widget = ImageWidget()
         self.stack.addWidget(self.image_widget)
         
-        # Video View
+        # Video, PDF, CSV and text views are built the first time they are needed
+        self.video_container = None
+        self.deck = None  # The two VideoDecks and the filmstrip come with the video view
+        self.preroll_deck = None
+        self.filmstrip = None
+        self.filmstrip_extractor = None
+        self._poster_path = None  # Video whose poster is on screen until its first frame
+        self.pdf_view = None
+        self.csv_widget = None
+        self.text_widget = None
+        
+        # Generic File/Folder View
+        self.generic_widget = GenericFileWidget()
+        self.stack.addWidget(self.generic_widget)
+        
+        # End/Done View
+        self.end_widget = EndWidget()
+        self.stack.addWidget(self.end_widget)
+        
+        # Time to first paint is reported once, from whichever page shows the first file
+        self._first_paint_pending = True
+        self._first_paint_page = None
+        self.stack.currentChanged.connect(self._watch_first_paint)
+        self._watch_first_paint()
+        
+        # Initial Load: the first item is shown as soon as the scanner finds it
+        self.scanner = DirectoryScanner(self)
+        self.scanner.batch_ready.connect(self._on_scan_batch)
+        self.scanner.finished.connect(self._on_scan_finished)
+        # Clear focus from any initial inputs if any (just in case)
+        self.setFocus()
+        self._start_scan()
+
+    # --- Viewer pages, built on first use ---
+
+    def _video_page(self):
+        """The video view (two decks and a filmstrip), or None without QtMultimedia."""
+        if self.video_container is not None or not load_multimedia():
+            return self.video_container
         self.video_container = QWidget()
         video_layout = QVBoxLayout(self.video_container)
         video_layout.setContentsMargins(0, 0, 0, 0)
         
-        self.video_widget = QVideoWidget()
-        # QVideoWidget usually handles aspect ratio well by default or can be set
-        # self.video_widget.setAspectRatioMode(Qt.AspectRatioMode.KeepAspectRatio)
-        video_layout.addWidget(self.video_widget)
+        # Two decks: the one playing and a muted one pre-rolled on the next video
+        self.deck = VideoDeck(self)
+        self.preroll_deck = VideoDeck(self)
+        self.video_stack = QStackedWidget()
+        for deck in (self.deck, self.preroll_deck):
+            # QVideoWidget usually handles aspect ratio well by default or can be set
+            # deck.widget.setAspectRatioMode(Qt.AspectRatioMode.KeepAspectRatio)
+            self.video_stack.addWidget(deck.widget)
+            deck.first_frame.connect(self._on_video_first_frame)
+        video_layout.addWidget(self.video_stack)
+        # Frames across long videos, to judge them without watching
+        self.filmstrip = FilmstripWidget()
+        self.filmstrip.slot_clicked.connect(self._seek_to_filmstrip_slot)
+        video_layout.addWidget(self.filmstrip)
+        self.filmstrip_extractor = FilmstripExtractor(os.path.join(user_cache_dir(), "filmstrips"), self)
+        self.filmstrip_extractor.frame_ready.connect(self._on_filmstrip_frame)
+        self.filmstrip_extractor.strip_ready.connect(self._on_filmstrip)
         
         self.stack.addWidget(self.video_container)
+        return self.video_container
 
-        # PDF View
-        if PDF_SUPPORT:
+    def _pdf_page(self):
+        if self.pdf_view is None and load_pdf():
             self.pdf_view = NavigationPdfView(None)
             self.pdf_view.setPageMode(QPdfView.PageMode.MultiPage)
             self.pdf_view.setZoomMode(QPdfView.ZoomMode.FitInView)
             self.stack.addWidget(self.pdf_view)
-            
-        # CSV View
-        self.csv_widget = CsvWidget()
-        self.stack.addWidget(self.csv_widget)
-        
-        # Text View
-        self.text_widget = TextWidget()
-        self.stack.addWidget(self.text_widget)
-        
-        # Generic File/Folder View
-        self.generic_widget = GenericFileWidget()
-        self.stack.addWidget(self.generic_widget)
-        
-        # End/Done View
-        self.end_widget = EndWidget()
-        self.stack.addWidget(self.end_widget)
-        
-        # Media Player Setup
-        self.player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.player.setAudioOutput(self.audio_output)
-        self.player.setVideoOutput(self.video_widget)
-        
-        # Initial Load
-        if not self.files:
-            # If files were found originally but filtered out by log, show end screen
-            # check raw scan
-            raw_files = [f for f in os.listdir(self.directory) if not f.startswith('.') and f != '_rejected' and f != os.path.basename(__file__)]
-            if raw_files and len(self.viewed_files) > 0:
-                 self._show_end_screen()
-            else:
-                 print("No media files found.")
-                 QTimer.singleShot(0, self._finish_execution)
-        else:
-            # Clear focus from any initial inputs if any (just in case)
-            self.setFocus()
-            self._load_media()
+        return self.pdf_view
+
+    def _csv_page(self):
+        if self.csv_widget is None:
+            self.csv_widget = CsvWidget()
+            self.stack.addWidget(self.csv_widget)
+        return self.csv_widget
+
+    def _text_page(self):
+        if self.text_widget is None:
+            self.text_widget = TextWidget()
+            self.stack.addWidget(self.text_widget)
+        return self.text_widget
+
+    def _release_viewers(self):
+        """Stop playback and close whatever file the built viewers hold open."""
+        if self.deck is not None:
+            self.deck.release()
+            self.filmstrip_extractor.cancel()
+            self.filmstrip.reset()
+        self.image_widget.set_pixmap(None) # Clear previous image
+        if self.csv_widget is not None:
+            self.csv_widget.clear()
+        if self.text_widget is not None:
+            self.text_widget.clear()
+        self.generic_widget.cancel()
+        self._close_pdf()
+
+    def _watch_first_paint(self, index=None):
+        """Follow the page on screen until it has painted a file."""
+        if self._first_paint_page is not None:
+            self._first_paint_page.removeEventFilter(self)
+        self._first_paint_page = self.stack.currentWidget()
+        self._first_paint_page.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and obj is self._first_paint_page:
+            # An empty image page is just the window coming up, not the first file
+            if obj is not self.image_widget or self.image_widget.pixmap is not None:
+                self._first_paint_pending = False
+                obj.removeEventFilter(self)
+                self._first_paint_page = None
+                self.stack.currentChanged.disconnect(self._watch_first_paint)
+                print(f"First paint after {(time.perf_counter() - LAUNCHED) * 1000:.0f} ms.")
+                # Deferred until now: the quotes file and a pre-rolled video
+                QTimer.singleShot(0, self.quote_label.refresh_quote)
+                QTimer.singleShot(0, self._preroll_next_video)
+        return super().eventFilter(obj, event)
 
     def _load_log(self):
-        viewed = set()
-        if os.path.exists(self.log_file):
-            try:
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        viewed.add(line.strip())
-            except Exception as e:
-                print(f"Error reading log: {e}")
-        return viewed
+        try:
+            return ViewedLog(self.log_file, legacy_path=self.legacy_log_file)
+        except sqlite3.Error as e:
+            print(f"Error opening log: {e}")
+            sys.exit(1)
 
-    def _log_file_viewed(self, filename):
-        if filename not in self.viewed_files:
-            self.viewed_files.add(filename)
+    def _log_file_viewed(self, filename, action='viewed', st=None):
+        """Record the decision for `filename`. Pass `st` when the file has already been moved."""
+        if st is None:
             try:
-                with open(self.log_file, 'a', encoding='utf-8') as f:
-                    f.write(filename + "\n")
-            except Exception as e:
-                print(f"Error writing to log: {e}")
+                st = os.stat(os.path.join(self.directory, filename))
+            except OSError:
+                st = None
+        self.viewed_log.record(filename, action, st)
 
     def _reset_log(self):
-        self.viewed_files.clear()
-        if os.path.exists(self.log_file):
-            try:
-                os.remove(self.log_file)
-            except Exception as e:
-                print(f"Error resetting log: {e}")
+        self.viewed_log.reset()
+
+        # Unapplied --deferred decisions point at the old list; drop them too
+        if self._applying:
+            # The journal still tracks moves in flight, so undo just these
+            for decision in reversed(self.decisions):
+                self.journal.append('undo', name=decision['name'])
+        else:
+            self.journal.clear()
+        self.decisions = []
+        self._decided_names = set()
+        self._update_pending_label()
+
+        # Duplicates and bursts are found again once the rescan finishes
+        self.duplicate_finder.cancel()
+        self.burst_grouper.cancel()
+        self.duplicate_of = {}
+        self.cluster_of = {}
+        self._hash_progress = None
+        self._update_badge()
         
         # Rescan
-        self.files = self._scan_directory()
+        self.files = []
         self.current_index = 0
-        self._preload_cache.clear()
-        
-        if self.files:
-            self.lbl_reject.show()
-            self.lbl_keep.show()
-            self.lbl_filename.show()
-            self.lbl_hint.show()
-            self._load_media()
-        else:
-            self._show_end_screen()
+        self.lbl_reject.show()
+        self.lbl_keep.show()
+        self.lbl_filename.show()
+        self.lbl_hint.show()
+        self._start_scan()
 
     def _load_flags(self):
         defaults = [
@@ -605,20 +3477,7 @@ class MediaCuller(QMainWindow):
             {'name': '', 'color': '#8be9fd'}, # D - Cyan
             {'name': '', 'color': '#f1fa8c'}  # F - Yellow
         ]
-        
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r') as f:
-                    loaded = json.load(f)
-                    # Check for legacy defaults and clear them if found
-                    legacy_names = {'Reject', 'Maybe', 'Good', 'Best'}
-                    for item in loaded:
-                        if item.get('name') in legacy_names:
-                            item['name'] = ''
-                    return loaded
-            except:
-                pass
-        return defaults
+        return load_flags(self.config_file) or defaults
 
     def _save_flags(self):
         try:
@@ -641,37 +3500,229 @@ class MediaCuller(QMainWindow):
         self.stack.setCurrentWidget(self.end_widget)
         self.setWindowTitle("winnow - Done")
 
+    def _is_scan_candidate(self, f):
+        return is_scan_candidate(f)
+
+    def _start_scan(self):
+        self._scan_done = False
+        self._waiting_for_scan = True
+        self.setWindowTitle("winnow")
+        self.lbl_filename.setText("Scanning...")
+        self.scanner.start(self.directory, self._is_scan_candidate, self._is_decided_entry)
+
+    def _is_decided_entry(self, entry):
+        # Runs on the scanner thread
+        return entry.name in self._decided_names or self.viewed_log.contains_entry(entry)
+
+    def _on_scan_batch(self, generation, names):
+        if generation != self.scanner.generation:
+            return
+        # Items up to the cursor stay put; new names are merged into the unseen tail
+        # (sort() detects the two runs, so this is a linear merge)
+        tail = self.files[self.current_index + 1:]
+        tail.extend(names)
+        tail.sort()
+        self.files[self.current_index + 1:] = tail
+
+        if self._waiting_for_scan:
+            self._waiting_for_scan = False
+            self._load_media()
+        else:
+            self._update_filename_label()
+            self._preload_window()
+
+    def _on_scan_finished(self, generation, seen, skipped):
+        if generation != self.scanner.generation:
+            return
+        self._scan_done = True
+        print(f"Found {len(self.files)} new items (Total items in dir: {seen}).")
+        self.duplicate_finder.start(self.directory, self.files)
+        if self.bursts_enabled:
+            self.burst_grouper.start(self.directory, [f for f in self.files if self._is_image_name(f)])
+        if not self.files:
+            # If files were found originally but filtered out by log, show end screen
+            if skipped > 0:
+                self._show_end_screen()
+            else:
+                print("No media files found.")
+                QTimer.singleShot(0, self._finish_execution)
+        elif self._waiting_for_scan:
+            self._waiting_for_scan = False
+            self._load_media()
+        else:
+            self._update_filename_label()
+
+    def _update_filename_label(self):
+        if self.current_index >= len(self.files):
+            return
+        total = f"{len(self.files)}" if self._scan_done else f"{len(self.files)}+"
+        self.lbl_filename.setText(f"{self.current_index + 1}/{total}: {self.files[self.current_index]}")
+        self._update_badge()
+
+    def _is_image_name(self, name):
+        ext = os.path.splitext(name)[1].lower()
+        return ext in self.image_exts or ext in self.raw_exts
+
+    # --- Bursts ---
+
+    def _on_hash_progress(self, done, total):
+        self._hash_progress = (done, total) if done < total else None
+        self._update_badge()
+
+    def _on_clusters_ready(self, clusters):
+        self.cluster_of = {}
+        for cluster in clusters:
+            for name in cluster:
+                self.cluster_of[name] = cluster
+        print(f"Found {len(clusters)} bursts ({sum(len(c) for c in clusters)} images).")
+        self._group_clusters_in_tail()
+        self._update_badge()
+
+    def _group_clusters_in_tail(self):
+        """Reorder the unseen items so each burst is shown back to back, starting with the current one's."""
+        if not self.cluster_of or self.current_index >= len(self.files):
+            return
+        current = self.cluster_of.get(self.files[self.current_index])
+        tail = self.files[self.current_index + 1:]
+        anchors = {}
+        order = []
+        for pos, name in enumerate(tail):
+            cluster = self.cluster_of.get(name)
+            if cluster is None:
+                anchor = pos
+            elif cluster is current:
+                anchor = -1
+            else:
+                anchor = anchors.setdefault(id(cluster), pos)
+            order.append((anchor, pos, name))
+        order.sort()
+        self.files[self.current_index + 1:] = [name for _, _, name in order]
+        self._preload_window()
+
+    def _burst_others(self):
+        """Other members of the current file's burst that are still ahead of the cursor."""
+        if self.current_index >= len(self.files):
+            return []
+        cluster = self.cluster_of.get(self.files[self.current_index])
+        if not cluster:
+            return []
+        members = set(cluster)
+        return [f for f in self.files[self.current_index + 1:] if f in members]
+
+    def _keep_best_of_burst(self):
+        """Keep the current image and reject every other shot of its burst in one go."""
+        others = self._burst_others()
+        if not others:
+            return
+        if self.deferred:
+            for name in others:
+                self._record_decision('reject', self.rejected_dir, index=self.files.index(name), load=False)
+        else:
+            srcs = []
+            for name in others:
+                src = os.path.join(self.directory, name)
+                try:
+                    st = os.lstat(src)
+                except OSError:
+                    continue
+                self._log_file_viewed(name, 'reject', st)
+                srcs.append(src)
+            members = set(others)
+            self.files[self.current_index + 1:] = [f for f in self.files[self.current_index + 1:] if f not in members]
+            if self.preroll_deck is not None:
+                self.preroll_deck.release()  # It may hold one of these open
+            self.move_queue.submit_group(srcs, self.rejected_dir)
+        print(f"Kept {self.files[self.current_index]}, rejected {len(others)} other shots of its burst.")
+        self._animate_and_navigate(direction=1, action='keep')
+
+    # --- Duplicates ---
+
+    def _on_duplicates_ready(self, duplicates):
+        self.duplicate_of = duplicates
+        if duplicates:
+            print(f"Found {len(duplicates)} redundant copies of {len(set(duplicates.values()))} files.")
+        self._update_badge()
+
+    def _redundant_copies(self):
+        """
+        Undecided files from the cursor on whose identical original is still in
+        place and not on its way out. Copies before the cursor or with a decision
+        (pending or logged) were already kept and are left alone.
+        """
+        leaving = {d['name'] for d in self.decisions if d['action'] != 'keep'}
+        return [f for f in self.files[self.current_index:]
+                if f in self.duplicate_of and self.duplicate_of[f] not in leaving
+                and f not in self._decided_names and not self.viewed_log.contains(f)
+                and os.path.exists(os.path.join(self.directory, self.duplicate_of[f]))]
+
+    def _reject_duplicates(self):
+        """Reject every redundant copy from the cursor on in one go."""
+        redundant = self._redundant_copies()
+        if not redundant:
+            self.notification.notify("No duplicates to reject.", 2000)
+            return
+        if self.current_index < len(self.files) and self.files[self.current_index] in redundant:
+            self._release_current()
+        if self.deferred:
+            for name in redundant:
+                self._record_decision('reject', self.rejected_dir, index=self.files.index(name), load=False)
+        else:
+            srcs = []
+            for name in redundant:
+                src = os.path.join(self.directory, name)
+                try:
+                    st = os.lstat(src)
+                except OSError:
+                    continue
+                self._log_file_viewed(name, 'reject', st)
+                srcs.append(src)
+            gone = set(redundant)
+            self.current_index -= sum(1 for f in self.files[:self.current_index] if f in gone)
+            self.files = [f for f in self.files if f not in gone]
+            if self.preroll_deck is not None:
+                self.preroll_deck.release()  # It may hold one of these open
+            self.move_queue.submit_group(srcs, self.rejected_dir)
+        self.notification.notify(f"Rejected {len(redundant)} duplicate{'s' if len(redundant) != 1 else ''}.", 2000)
+        self._load_media()
+
+    def _update_badge(self):
+        parts = []
+        if self.current_index < len(self.files):
+            name = self.files[self.current_index]
+            original = self.duplicate_of.get(name)
+            if original and os.path.exists(os.path.join(self.directory, original)):
+                parts.append(f"duplicate of {original} • X rejects every duplicate from here on")
+            cluster = self.cluster_of.get(name)
+            if cluster:
+                text = f"burst {cluster.index(name) + 1}/{len(cluster)}"
+                others = len(self._burst_others())
+                if others:
+                    text += f" • K keeps this and rejects {others} other{'s' if others != 1 else ''}"
+                parts.append(text)
+        if self._hash_progress:
+            parts.append(f"grouping bursts {self._hash_progress[0]}/{self._hash_progress[1]}")
+        self.lbl_badge.setText(" • ".join(parts))
+        self.lbl_badge.setVisible(bool(parts))
+
     def _scan_directory(self):
-        found_files = []
+        """Synchronous, sorted scan of the directory (the GUI streams it via DirectoryScanner)."""
         try:
-            entries = os.listdir(self.directory)
-            entries.sort()
-            for f in entries:
-                if f.startswith('.') or f == '_rejected': continue
-                if f == os.path.basename(__file__): continue
-                if f == "flags.json": continue
-                
-                # Check log
-                if f in self.viewed_files: continue
-                
-                # Check if it's a directory? The requirements say "browses all file types AND folders".
-                # But creating flag folders might create a loop if we scan them.
-                # We should exclude the flag folders from the scan to avoid moving a folder into itself or similar.
-                # Since flag folder names are dynamic, we just rely on "viewed" log or user sense?
-                # Best practice: Skip folders that match current flag names? 
-                # For now, simplistic scan.
-                
-                full_path = os.path.join(self.directory, f)
-                found_files.append(f)
+            found_files, total = scan_directory(self.directory, self.viewed_log)
         except Exception as e:
             print(f"Error scanning directory: {e}")
             sys.exit(1)
         
-        print(f"Found {len(found_files)} new items (Total items in dir: {len(entries) if 'entries' in locals() else '?'}).")
+        print(f"Found {len(found_files)} new items (Total items in dir: {total}).")
         return found_files
 
     def _load_media(self):
         if self.current_index >= len(self.files):
+            self._update_badge()
+            if not self._scan_done:
+                # Ran ahead of the scanner; the next batch resumes here
+                self._waiting_for_scan = True
+                self.lbl_filename.setText("Scanning...")
+                return
             self._show_end_screen()
             return
 
@@ -680,13 +3731,12 @@ class MediaCuller(QMainWindow):
         ext = os.path.splitext(filename)[1].lower()
         
         self.setWindowTitle("winnow")
-        self.lbl_filename.setText(f"{self.current_index + 1}/{len(self.files)}: {filename}")
+        self._update_filename_label()
         
         # Reset Player
-        self.player.stop()
-        self.player.setSource(QUrl())
-        self.image_widget.set_pixmap(None) # Clear previous image
-        self.current_pdf_doc = None # Clear PDF doc reference
+        self._release_viewers()
+        self._poster_path = None
+        self._pending_image_path = None
 
         # Check if we should update the quote
         should_refresh_quote = False
@@ -702,51 +3752,62 @@ class MediaCuller(QMainWindow):
         # Ensure quote is visible (it might have been hidden by specific views previously, restore logic)
         self.quote_label.show() 
 
-        if ext in self.image_exts:
+        if ext in self.image_exts or ext in self.raw_exts:
             self.stack.setCurrentWidget(self.image_widget)
             
-            # Check cache
-            if self.current_index in self._preload_cache:
-                qimg = self._preload_cache.pop(self.current_index)
-                pixmap = QPixmap.fromImage(qimg)
-            else:
-                pixmap = QPixmap(file_path)
-            
-            if not pixmap.isNull():
-                self.image_widget.set_pixmap(pixmap)
+            # Only ever show an already-decoded image; otherwise wait for the pool
+            key = self._image_key(file_path)
+            qimg = self.image_cache.get(key) if key is not None else None
+            if qimg is not None:
+                self._show_image(qimg, file_path, filename)
+            elif key is None or key in self._decode_failed:
+                self._show_image(QImage(), file_path, filename)
             else:
-                # If image load fails, treat as generic
-                self.stack.setCurrentWidget(self.generic_widget)
-                self.generic_widget.set_item(file_path, filename, False)
-                # self.quote_label.show() # Already shown
+                self._pending_image_path = file_path
+                # Paint the embedded thumbnail now; the full decode swaps in when it lands
+                thumb = load_exif_thumbnail(file_path)
+                if not thumb.isNull():
+                    self.image_widget.set_pixmap(QPixmap.fromImage(thumb))
                 
-        elif ext in self.video_exts:
-            self.stack.setCurrentWidget(self.video_container)
-            self.player.setSource(QUrl.fromLocalFile(file_path))
-            self.player.play()
-        
-        elif PDF_SUPPORT and ext in self.pdf_exts:
-            self.stack.setCurrentWidget(self.pdf_view)
-            self.current_pdf_doc = QPdfDocument(self)
-            try:
-                self.current_pdf_doc.load(file_path)
-                if self.current_pdf_doc.status() == QPdfDocument.Status.Ready:
-                    self.pdf_view.setDocument(self.current_pdf_doc)
+        elif ext in self.video_exts and self._video_page() is not None:
+            if self.preroll_deck.path == file_path:
+                # Already open and parked on its first frame
+                self.deck, self.preroll_deck = self.preroll_deck, self.deck
+                self.deck.audio_output.setMuted(False)
+                self.stack.setCurrentWidget(self.video_container)
+            else:
+                self.deck.open(file_path)
+                key = self._image_key(file_path)
+                poster = self.image_cache.get(key) if key is not None else None
+                if poster is not None:
+                    # Show the cached poster until the player has a frame
+                    self._poster_path = file_path
+                    self.stack.setCurrentWidget(self.image_widget)
+                    self.image_widget.set_pixmap(QPixmap.fromImage(poster))
                 else:
-                    # Fallback
-                    self.stack.setCurrentWidget(self.generic_widget)
-                    self.generic_widget.set_item(file_path, filename, False)
-            except Exception as e:
-                print(f"Error loading PDF: {e}")
-                self.stack.setCurrentWidget(self.generic_widget)
-                self.generic_widget.set_item(file_path, filename, False)
+                    self.stack.setCurrentWidget(self.video_container)
+            self.video_stack.setCurrentWidget(self.deck.widget)
+            self.deck.player.play()
+            self.filmstrip_extractor.start(file_path)
+        
+        elif ext in self.pdf_exts and load_pdf():
+            # Page 1 comes pre-rendered from the decode pool; the interactive
+            # view takes over once the document has loaded in the background
+            self.stack.setCurrentWidget(self.image_widget)
+            key = self._image_key(file_path)
+            qimg = self.image_cache.get(key) if key is not None else None
+            if qimg is not None:
+                self.image_widget.set_pixmap(QPixmap.fromImage(qimg))
+            elif key is not None and key not in self._decode_failed:
+                self._pending_image_path = file_path
+            self.pdf_loader.start(file_path)
         
         elif ext in self.csv_exts:
-             self.stack.setCurrentWidget(self.csv_widget)
+             self.stack.setCurrentWidget(self._csv_page())
              self.csv_widget.load_csv(file_path)
 
         elif ext in self.txt_exts:
-            self.stack.setCurrentWidget(self.text_widget)
+            self.stack.setCurrentWidget(self._text_page())
             self.text_widget.load_text(file_path)
 
         else:
@@ -755,23 +3816,179 @@ class MediaCuller(QMainWindow):
             self.stack.setCurrentWidget(self.generic_widget)
             self.generic_widget.set_item(file_path, filename, is_dir)
             
-        # Trigger Preload for next item
-        self._preload_next()
+        # Trigger Preload for the window around the cursor
+        self._preload_window()
+        self._preroll_next_video()
 
-    def _preload_next(self):
-        next_idx = self.current_index + 1
-        if next_idx < len(self.files):
-            fname = self.files[next_idx]
-            ext = os.path.splitext(fname)[1].lower()
-            if ext in self.image_exts and next_idx not in self._preload_cache:
+    def _preroll_next_video(self):
+        """Park the muted deck on the next video in the lookahead window."""
+        if self._first_paint_pending:
+            return  # Nothing starts the media backend before the first file is on screen
+        for idx in range(self.current_index + 1, min(len(self.files), self.current_index + self.preload_ahead + 1)):
+            fname = self.files[idx]
+            if os.path.splitext(fname)[1].lower() in self.video_exts:
                 path = os.path.join(self.directory, fname)
-                # Load QImage in a way that doesn't block too much. 
-                # For a simple script, doing it directly is usually fine unless images are massive.
-                # To be super smooth, use a QThread, but avoiding complexity for "complete single file".
-                # We'll just load it. If user notices lag, they can ask for optimization.
-                img = QImage(path)
-                if not img.isNull():
-                    self._preload_cache[next_idx] = img
+                if self._video_page() is not None and self.preroll_deck.path != path:
+                    self.preroll_deck.open(path, muted=True)
+                    self.preroll_deck.player.pause()
+                return
+        if self.preroll_deck is not None and self.preroll_deck.path is not None:
+            self.preroll_deck.release()
+
+    def _current_path(self):
+        if self.current_index >= len(self.files):
+            return None
+        return os.path.join(self.directory, self.files[self.current_index])
+
+    def _on_filmstrip_frame(self, path, slot, img):
+        if path == self._current_path():
+            self.filmstrip.set_frame(slot, img)
+
+    def _on_filmstrip(self, path, frames):
+        if path == self._current_path():
+            self.filmstrip.set_frames(frames)
+
+    def _seek_to_filmstrip_slot(self, slot):
+        duration = self.deck.player.duration()
+        if duration > 0:
+            self.deck.player.setPosition(duration * (2 * slot + 1) // (2 * FILMSTRIP_FRAMES))
+
+    def _on_video_first_frame(self, path, frame):
+        """Keep the first frame as the video's poster, in memory and in the preview store."""
+        key = self._image_key(path)
+        if key is not None and key not in self.image_cache:
+            poster = frame.scaled(self._decode_size, Qt.AspectRatioMode.KeepAspectRatio,
+                                  Qt.TransformationMode.SmoothTransformation) \
+                if frame.width() > self._decode_size.width() or frame.height() > self._decode_size.height() else frame
+            self.image_cache.put(key, poster)
+            self._decode_failed.discard(key)
+            if self.preview_store is not None:
+                self.preview_store.save(path, poster)
+        if path == self._poster_path and path == self.deck.path:
+            self._poster_path = None
+            self.stack.setCurrentWidget(self.video_container)
+
+    def _show_image(self, qimg, file_path, filename, refine=False):
+        if not qimg.isNull():
+            self.image_widget.set_pixmap(QPixmap.fromImage(qimg), refine=refine)
+        else:
+            # If image load fails, treat as generic
+            self.stack.setCurrentWidget(self.generic_widget)
+            self.generic_widget.set_item(file_path, filename, False)
+
+    def _display_target(self):
+        """Size of the image area in device pixels, rounded up to 128px steps."""
+        # Before the first show the stack has no real geometry yet; the window bounds it
+        size = self.stack.size() if self.stack.isVisible() else self.size()
+        dpr = self.devicePixelRatioF()
+        step = 128
+        w = -(-int(size.width() * dpr) // step) * step
+        h = -(-int(size.height() * dpr) // step) * step
+        return QSize(max(w, step), max(h, step))
+
+    def _image_key(self, path):
+        if not self._decode_size.isValid():
+            self._decode_size = self._display_target()
+        return ImageCache.key(path, self._decode_size)
+
+    def _update_decode_size(self):
+        """
+        Grow the decode size when the image area outgrows it. Shrinking keeps
+        the larger decodes, since they still look sharp.
+        """
+        target = self._display_target()
+        if self._decode_size.isValid() and \
+                target.width() <= self._decode_size.width() and target.height() <= self._decode_size.height():
+            return
+        self._decode_size = target.expandedTo(self._decode_size) if self._decode_size.isValid() else target
+        # Cached images are now keyed too small; keep showing the current one until its replacement lands
+        if self.current_index < len(self.files) and self.stack.currentWidget() is self.image_widget \
+                and self._pending_image_path is None and self._poster_path is None:
+            self._pending_image_path = os.path.join(self.directory, self.files[self.current_index])
+        self._preload_window()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.resize_timer.start(150)
+
+    def _preload_window(self):
+        """
+        Queue decodes for the current item plus `preload_ahead` items after it
+        and `preload_behind` before it, prioritised by distance from the cursor.
+        Queued jobs outside the window are cancelled; decoded images stay in
+        the LRU cache so stepping back is instant.
+        """
+        jobs = []
+        for offset in range(-self.preload_behind, self.preload_ahead + 1):
+            idx = self.current_index + offset
+            if idx < 0 or idx >= len(self.files):
+                continue
+            fname = self.files[idx]
+            ext = os.path.splitext(fname)[1].lower()
+            if ext not in self.image_exts and ext not in self.raw_exts and ext not in self.pdf_exts \
+                    and ext not in self.video_exts:
+                continue
+            key = self._image_key(os.path.join(self.directory, fname))
+            if key is not None and key not in self.image_cache and key not in self._decode_failed:
+                # Ahead wins ties with behind
+                jobs.append((key, 2 * abs(offset) + (1 if offset < 0 else 0)))
+        self.decode_pool.schedule(jobs)
+
+    def _on_image_decoded(self, key, qimg):
+        path, decode_size = key[0], QSize(*key[3])
+        if qimg.isNull():
+            self._decode_failed.add(key)
+        else:
+            self.image_cache.put(key, qimg)
+        if path == self._pending_image_path:
+            # Show even a stale-size decode rather than nothing. Whatever is on
+            # screen (thumbnail or older decode) is this same image, so no burst.
+            self._show_image(qimg, path, os.path.basename(path), refine=True)
+            if decode_size == self._decode_size or qimg.isNull():
+                self._pending_image_path = None
+                if self.current_pdf_doc is not None:
+                    QTimer.singleShot(0, self._attach_pdf)
+        if decode_size != self._decode_size:
+            # Raced with a resize; queue the window again at the new size
+            self._preload_window()
+
+    def _on_pdf_loaded(self, generation, doc):
+        if generation != self.pdf_loader.generation:
+            doc.deleteLater()
+            return
+        if doc.status() != QPdfDocument.Status.Ready:
+            doc.deleteLater()
+            print(f"Error loading PDF: {doc.error()}")
+            if self.current_index >= len(self.files):
+                return
+            filename = self.files[self.current_index]
+            self.stack.setCurrentWidget(self.generic_widget)
+            self.generic_widget.set_item(os.path.join(self.directory, filename), filename, False)
+            return
+        self.current_pdf_doc = doc
+        # Let the pre-rendered page paint first
+        QTimer.singleShot(0, self._attach_pdf)
+
+    def _attach_pdf(self):
+        if self.current_pdf_doc is None or self._pending_image_path is not None \
+                or self._pdf_page() is None or self.pdf_view.document() is self.current_pdf_doc:
+            return
+        previous, self._shown_pdf_doc = self._shown_pdf_doc, self.current_pdf_doc
+        self.pdf_view.setDocument(self.current_pdf_doc)
+        if previous is not None:
+            previous.deleteLater()
+        self.stack.setCurrentWidget(self.pdf_view)
+
+    def _close_pdf(self):
+        """Drop the current document; only the one on screen is ever kept open."""
+        self.pdf_loader.cancel()
+        if self.current_pdf_doc is not None:
+            # Closing releases the file. The view keeps the emptied document until
+            # the next one replaces it: detaching (setDocument(None)) makes Qt warn
+            self.current_pdf_doc.close()
+            if self.current_pdf_doc is not self._shown_pdf_doc:
+                self.current_pdf_doc.deleteLater()
+            self.current_pdf_doc = None
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -817,9 +4034,25 @@ class MediaCuller(QMainWindow):
             super().keyPressEvent(event)
             return
 
+        # Anything else happens after the keeps queued before it
+        self._flush_input()
+
+        # Deferred mode: Cmd+S applies, Cmd+Z / Backspace undoes
+        command = event.modifiers() & (Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.MetaModifier)
+        if self.deferred and key == Qt.Key.Key_S and command:
+            self._commit_decisions()
+            return
+        if self.deferred and (key == Qt.Key.Key_Backspace or (key == Qt.Key.Key_Z and command)):
+            self._undo_decision()
+            return
+
         if key == Qt.Key.Key_Right:
-            self._animate_and_navigate(direction=1, action='keep')
-        elif key == Qt.Key.Key_Left:
+            # Applied once the event queue drains, so a burst becomes one jump
+            self._queued_keeps += 1
+            self.input_timer.start(0)
+            return
+
+        if key == Qt.Key.Key_Left:
             self._animate_and_navigate(direction=-1, action='reject')
         elif key == Qt.Key.Key_A:
             self._sort_file(0)
@@ -829,6 +4062,12 @@ class MediaCuller(QMainWindow):
             self._sort_file(2)
         elif key == Qt.Key.Key_F:
             self._sort_file(3)
+        elif key == Qt.Key.Key_K and self.bursts_enabled:
+            self._keep_best_of_burst()
+        elif key == Qt.Key.Key_X:
+            self._reject_duplicates()
+        elif key == Qt.Key.Key_Space and self.stack.currentWidget() is self.text_widget:
+            self.text_widget.toggle_full()
         elif key == Qt.Key.Key_Escape:
             # Already handled above
             pass
@@ -838,71 +4077,187 @@ class MediaCuller(QMainWindow):
     def _reset_esc_pending(self):
         self.esc_pending = False
         # Restore hint text
-        self.lbl_hint.setText("Left/Right to Reject/Keep • A/S/D/F to Sort • esc to finish")
+        self.lbl_hint.setText(self.hint_text)
         self.lbl_hint.setStyleSheet("color: #444; font-size: 10px; font-style: italic;")
 
     def _sort_file(self, flag_index):
         if self.current_index >= len(self.files): return
         
-        filename = self.files[self.current_index]
         flag = self.flags[flag_index]
-        target_dir = os.path.join(self.directory, flag['name'])
-        
-        if not os.path.exists(target_dir):
-            try:
-                os.makedirs(target_dir)
-            except:
-                print(f"Could not create {target_dir}")
-                return
+        # Animate from what is on screen before it is released
+        self._animate_sort(flag_index)
+        self._queue_move(os.path.join(self.directory, flag['name']), f"flag:{flag['name']}")
+
+    def _release_current(self):
+        # Release file handles so the file can be moved
+        self._release_viewers()
 
+    def _queue_move(self, target_dir, action):
+        """Hand the current file to the move queue and go straight on to the next one."""
+        if self.deferred:
+            self._record_decision(action, target_dir)
+            return
+        filename = self.files[self.current_index]
         src = os.path.join(self.directory, filename)
-        dst = os.path.join(target_dir, filename)
-        
-        # Handle collision
-        if os.path.exists(dst):
-             base, ext = os.path.splitext(filename)
-             import uuid
-             dst = os.path.join(target_dir, f"{base}_{uuid.uuid4().hex[:6]}{ext}")
-             
         try:
-            # Release handles
-            self.player.stop()
-            self.player.setSource(QUrl())
-            self.image_widget.set_pixmap(None)
-            if PDF_SUPPORT:
-                self.pdf_view.setDocument(None)
-            self.current_pdf_doc = None
-            
-            shutil.move(src, dst)
-            print(f"Moved {filename} to {flag['name']}")
-            
-            # Log
-            self._log_file_viewed(filename)
-            
-            # Animate
-            self._animate_sort(flag_index)
-            
-            # Next
-            del self.files[self.current_index]
-            if self.current_index in self._preload_cache:
-                del self._preload_cache[self.current_index]
+            st = os.lstat(src)
+        except OSError as e:
+            self.notification.notify(f"Could not move {filename}: {e}")
+            return
+        
+        self._release_current()
+        self.move_queue.submit(src, target_dir)
+        
+        # Log now; a failed move takes it back out
+        self._log_file_viewed(filename, action, st)
+        
+        # Don't increment index, just refresh current (which is now the next item)
+        del self.files[self.current_index]
+        self._load_media()
+
+    def _on_move_progress(self, job_id, src, done, total):
+        self._move_progress = (src, done, total)
+        self._update_pending_label()
+
+    def _on_move_finished(self, job_id, src, dst, error):
+        if self._move_progress and self._move_progress[0] == src:
+            self._move_progress = None
+        filename = os.path.basename(src)
+        if filename in self._applying:
+            # Resolved either way: moved, or back in the list below
+            self._applying.discard(filename)
+            self.journal.append('done', name=filename)
+            if not self._applying and not self.decisions:
+                self.journal.clear()
+        if not error:
+            print(f"Moved '{filename}' to {os.path.relpath(os.path.dirname(dst), self.directory)}.")
+            return
+        print(f"Could not move '{filename}': {error}")
+        self.notification.notify(f"Could not move {filename}: {error}")
+        # Put it back in front of the user
+        self.viewed_log.forget(filename)
+        if self.stack.currentWidget() is self.end_widget:
+            self.files.append(filename)
+            self.current_index = len(self.files) - 1
+            self.lbl_reject.show()
+            self.lbl_keep.show()
+            self.lbl_filename.show()
+            self.lbl_hint.show()
             self._load_media()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not move file: {e}")
+        else:
+            self.files.insert(min(self.current_index + 1, len(self.files)), filename)
+            self._update_filename_label()
 
-    def _animate_sort(self, flag_index):
-        # 1. Grab visual
-        current_pixmap = self.stack.grab()
+    def _on_moves_pending(self, pending):
+        self._update_pending_label()
+        if not pending and self._close_when_idle:
+            self.close()
+
+    def _update_pending_label(self):
+        parts = []
+        pending = self.move_queue.pending()
+        if pending:
+            text = f"moving {pending} file{'s' if pending != 1 else ''}..."
+            if self._move_progress:
+                src, done, total = self._move_progress
+                text += f" ({os.path.basename(src)} {100 * done // max(total, 1)}%)"
+            parts.append(text)
+        if self.decisions:
+            parts.append(f"{len(self.decisions)} decision{'s' if len(self.decisions) != 1 else ''} not applied (Cmd+S)")
+        self.lbl_pending.setText(" • ".join(parts))
+        self.lbl_pending.setVisible(bool(parts))
+
+    # --- Deferred mode ---
+
+    def _record_decision(self, action, target_dir, index=None, load=True):
+        """O(1) in-memory decision plus a journal line; nothing on disk moves yet."""
+        if index is None:
+            index = self.current_index
+        filename = self.files[index]
+        decision = {'name': filename, 'action': action, 'target': target_dir, 'index': index}
+        self.decisions.append(decision)
+        self._decided_names.add(filename)
+        self.journal.append('decide', **decision)
+        
+        if action == 'keep':
+            self.current_index += 1
+        else:
+            del self.files[index]
+            if index < self.current_index:
+                self.current_index -= 1
+        self._update_pending_label()
+        if load:
+            self._load_media()
+
+    def _undo_decision(self):
+        if not self.decisions:
+            self.notification.notify("Nothing to undo.", 2000)
+            return
+        decision = self.decisions.pop()
+        filename = decision['name']
+        self._decided_names.discard(filename)
+        self.journal.append('undo', name=filename)
         
-        # 2. Overlay
-        # Use RotatableLabel for tilt
-        overlay = RotatableLabel(self.stack_container)
-        overlay.setPixmap(current_pixmap)
-        overlay.setGeometry(self.stack.geometry())
-        overlay.show()
+        idx = min(decision['index'], len(self.files))
+        if idx >= len(self.files) or self.files[idx] != filename:
+            self.files.insert(idx, filename)
+        self.current_index = idx
+        if self.stack.currentWidget() is self.end_widget:
+            self.lbl_reject.show()
+            self.lbl_keep.show()
+            self.lbl_filename.show()
+            self.lbl_hint.show()
+        self._update_pending_label()
+        self._load_media()
+
+    def _commit_decisions(self):
+        """Apply every outstanding decision in one pass, grouped by target folder."""
+        if not self.decisions:
+            return
+        groups = {}  # {target dir: [src]}
+        for decision in self.decisions:
+            filename = decision['name']
+            src = os.path.join(self.directory, filename)
+            try:
+                st = os.lstat(src)
+            except OSError:
+                # Already moved before a crash, or gone
+                self.journal.append('done', name=filename)
+                continue
+            self.viewed_log.record(filename, decision['action'], st)
+            if decision['action'] == 'keep':
+                self.journal.append('done', name=filename)
+                continue
+            groups.setdefault(decision['target'], []).append(src)
+            self._applying.add(filename)
+        self.journal.sync()
+        self.viewed_log.flush()
         
-        # 3. Setup Animation
+        count = len(self.decisions)
+        self.decisions = []
+        self._decided_names = set()
+        for target_dir, srcs in groups.items():
+            if self.preroll_deck is not None:
+                self.preroll_deck.release()  # It may hold one of these open
+            self.move_queue.submit_group(srcs, target_dir)
+        if not self._applying:
+            self.journal.clear()
+        print(f"Applied {count} decisions ({sum(len(v) for v in groups.values())} moves queued).")
+        self._update_pending_label()
+
+    def _snapshot(self, scale=0.5):
+        """The stack rendered at reduced resolution; it is moving and fading anyway."""
+        pixmap = QPixmap(max(1, int(self.stack.width() * scale)), max(1, int(self.stack.height() * scale)))
+        pixmap.fill(Qt.GlobalColor.black)
+        painter = QPainter(pixmap)
+        painter.scale(scale, scale)
+        self.stack.render(painter)
+        painter.end()
+        return pixmap
+
+    def _animate_sort(self, flag_index):
+        if self.turbo:
+            return
         # Direction logic:
         # A (0): Left Left
         # S (1): Left
@@ -914,156 +4269,111 @@ class MediaCuller(QMainWindow):
         
         tilts = [-15, -5, 5, 15]
         shifts_x = [-200, -50, 50, 200]
-        
-        end_x = overlay.x() + shifts_x[flag_index]
-        end_y = overlay.y() - 400 # Upwards
-        end_rot = tilts[flag_index]
-        
-        anim_group = QParallelAnimationGroup(overlay)
-        
-        # Pos
-        anim_pos = QPropertyAnimation(overlay, b"pos")
-        anim_pos.setDuration(300)
-        anim_pos.setStartValue(overlay.pos())
-        anim_pos.setEndValue(QPoint(end_x, end_y))
-        anim_pos.setEasingCurve(QEasingCurve.Type.OutCubic)
-        
-        # Rotation
-        anim_rot = QPropertyAnimation(overlay, b"rotation")
-        anim_rot.setDuration(300)
-        anim_rot.setStartValue(0.0)
-        anim_rot.setEndValue(end_rot)
-        
-        # Opacity
-        effect = QGraphicsOpacityEffect(overlay)
-        overlay.setGraphicsEffect(effect)
-        anim_op = QPropertyAnimation(effect, b"opacity")
-        anim_op.setDuration(300)
-        anim_op.setStartValue(1.0)
-        anim_op.setEndValue(0.0)
-        
-        anim_group.addAnimation(anim_pos)
-        anim_group.addAnimation(anim_rot)
-        anim_group.addAnimation(anim_op)
-        
-        anim_group.finished.connect(overlay.deleteLater)
-        anim_group.start()
+        # Upwards, tilting, fading
+        self.overlay.start(self._snapshot(), self.stack.geometry(), shifts_x[flag_index], -400,
+                           rotation=tilts[flag_index], duration=300, easing=QEasingCurve.Type.OutCubic)
 
     def _move_to_rejected(self):
         if self.current_index >= len(self.files):
             return
+        self._queue_move(self.rejected_dir, 'reject')
 
-        filename = self.files[self.current_index]
-        src = os.path.join(self.directory, filename)
-        dst = os.path.join(self.rejected_dir, filename)
-        
-        # Avoid overwrite
-        if os.path.exists(dst):
-            base, ext = os.path.splitext(filename)
-            import uuid
-            dst = os.path.join(self.rejected_dir, f"{base}_{uuid.uuid4().hex[:6]}{ext}")
-
-        try:
-            # Release file handles if possible
-            self.player.stop()
-            self.player.setSource(QUrl())
-            self.image_widget.set_pixmap(None)
-            if PDF_SUPPORT:
-                self.pdf_view.setDocument(None)
-            self.current_pdf_doc = None
-            
-            shutil.move(src, dst)
-            print(f"Moved '{filename}' to rejected.")
-            
-            # Log
-            self._log_file_viewed(filename)
-
-            # Remove from list
-            del self.files[self.current_index]
-            
-            # Don't increment index, just refresh current (which is now the next item)
-            # Clear cache for this index if it existed (unlikely as we just viewed it)
-            if self.current_index in self._preload_cache:
-                del self._preload_cache[self.current_index]
-                
-            self._load_media()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not move file:\n{e}")
-
-    def _animate_and_navigate(self, direction, action):
+    def _animate_and_navigate(self, direction, action, count=1):
         """
         Animate the current view sliding off to 'direction' (Left: -1, Right: 1).
-        Then perform the action (keep/reject) and load next.
+        Then perform the action (keep/reject) and load next. A keep can cover
+        `count` files at once (queued key presses), with a single transition.
         """
         if self.current_index >= len(self.files):
             return
 
         # 1. Grab current visual state
-        current_pixmap = self.stack.grab()
+        snapshot = None if self.turbo else self._snapshot()
         
-        # 2. Create overlay widget for animation
-        overlay = QLabel(self.stack_container)
-        overlay.setPixmap(current_pixmap)
-        overlay.setGeometry(self.stack.geometry())
-        overlay.show()
-        
-        # 3. Perform Logic seamlessly behind the overlay
+        # 2. Perform Logic seamlessly behind the overlay
         if action == 'reject':
             self._move_to_rejected()
             # _move_to_rejected calls _load_media(), updating self.stack
         elif action == 'keep':
-            # Log keep as viewed? Probably. The user made a decision.
-            # But "keep" implies staying in folder. So yes, viewed.
-            current_file = self.files[self.current_index]
-            self._log_file_viewed(current_file)
-            
-            self.current_index += 1
-            self.files_processed_since_quote += 1
+            count = min(count, len(self.files) - self.current_index)
+            self.files_processed_since_quote += count
+            if self.deferred:
+                for _ in range(count):
+                    self._record_decision('keep', None, load=False)
+            else:
+                # Log keep as viewed? Probably. The user made a decision.
+                # But "keep" implies staying in folder. So yes, viewed.
+                for current_file in self.files[self.current_index:self.current_index + count]:
+                    self._log_file_viewed(current_file, 'keep')
+                self.current_index += count
             self._load_media()
             
-        # 4. Setup Animation
-        # Slide off screen to Left (-width) or Right (+width)
-        end_x = -self.stack.width() if direction == -1 else self.stack.width()
-        
-        anim_group = QParallelAnimationGroup(overlay)
-        
-        # Position Animation
-        anim_pos = QPropertyAnimation(overlay, b"pos")
-        anim_pos.setDuration(250) # Lightweight, quick
-        anim_pos.setStartValue(overlay.pos())
-        anim_pos.setEndValue(QPoint(end_x, overlay.y()))
-        anim_pos.setEasingCurve(QEasingCurve.Type.InQuad)
-        
-        # Opacity Animation (Fade out)
-        effect = QGraphicsOpacityEffect(overlay)
-        overlay.setGraphicsEffect(effect)
-        anim_op = QPropertyAnimation(effect, b"opacity")
-        anim_op.setDuration(250)
-        anim_op.setStartValue(1.0)
-        anim_op.setEndValue(0.0)
-        
-        anim_group.addAnimation(anim_pos)
-        anim_group.addAnimation(anim_op)
-        
-        anim_group.finished.connect(overlay.deleteLater)
-        anim_group.start()
+        # 3. Slide off screen to Left (-width) or Right (+width), fading out
+        if snapshot is not None:
+            end_x = -self.stack.width() if direction == -1 else self.stack.width()
+            self.overlay.start(snapshot, self.stack.geometry(), end_x, 0, duration=250)
+
+    def _flush_input(self):
+        """Apply queued keeps as one jump with one transition."""
+        self.input_timer.stop()
+        count, self._queued_keeps = self._queued_keeps, 0
+        if count:
+            self._animate_and_navigate(direction=1, action='keep', count=count)
 
+    def closeEvent(self, event):
+        self._flush_input()
+        if self.decisions:
+            self._commit_decisions()
+        # Let queued moves finish; a half-done cross-device copy is worse than waiting
+        pending = self.move_queue.pending()
+        if pending:
+            self._close_when_idle = True
+            self.lbl_hint.setText(f"Finishing {pending} move{'s' if pending != 1 else ''} before exiting...")
+            event.ignore()
+            return
+        self.scanner.cancel()
+        self.burst_grouper.cancel()
+        self.duplicate_finder.cancel()
+        self.decode_pool.shutdown()
+        self.viewed_log.close()
+        self.journal.close()
+        stats = self.image_cache.stats()
+        print(f"Image cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions "
+              f"({stats['bytes'] // (1024 * 1024)}/{stats['budget'] // (1024 * 1024)} MB)")
+        if self.preview_store is not None:
+            print(f"Preview cache: {self.preview_store.hits} hits, {self.preview_store.misses} misses")
+        super().closeEvent(event)
 
     def _finish_execution(self):
         QMessageBox.information(self, "Done", "All files processed.")
         self.close()
 
 if __name__ == "__main__":
-    app_target_dir = os.getcwd() # Default
-    if len(sys.argv) > 1:
-        app_target_dir = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Cull a folder one file at a time.")
+    parser.add_argument("directory", nargs="?", default=os.getcwd())
+    parser.add_argument("--ahead", type=int, default=4, help="Images to decode ahead of the cursor (default: 4)")
+    parser.add_argument("--behind", type=int, default=1, help="Images to keep decoded behind the cursor (default: 1)")
+    parser.add_argument("--cache-mb", type=int, default=512, help="Memory budget for decoded images in MB (default: 512)")
+    parser.add_argument("--deferred", action="store_true",
+                        help="Record decisions and apply all moves at once on Cmd+S or exit (undo with Cmd+Z)")
+    parser.add_argument("--bursts", action="store_true",
+                        help="Group burst shots and near-duplicates (perceptual hashes on all cores); K keeps the best")
+    parser.add_argument("--turbo", action="store_true", help="No transition animations")
+    parser.add_argument("--verify-moves", action="store_true",
+                        help="Checksum files copied to another filesystem before deleting the original")
+    parser.add_argument("--preview-cache-mb", type=int, default=1024,
+                        help="Disk budget for cached previews in MB, 0 disables (default: 1024)")
+    args = parser.parse_args()
+    app_target_dir = args.directory
     
     if not os.path.isdir(app_target_dir):
         print(f"Error: '{app_target_dir}' is not a directory.")
         sys.exit(1)
 
     app = QApplication(sys.argv)
-    window = MediaCuller(app_target_dir)
+    window = MediaCuller(app_target_dir, preload_ahead=max(0, args.ahead), preload_behind=max(0, args.behind),
+                         cache_mb=max(1, args.cache_mb), preview_cache_mb=max(0, args.preview_cache_mb),
+                         deferred=args.deferred, verify_moves=args.verify_moves,
+                         bursts=args.bursts, turbo=args.turbo)
     window.show()
     sys.exit(app.exec())